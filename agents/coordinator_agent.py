@@ -1,4 +1,5 @@
 # from langchain_core.runnables import Runnable
+
 # from signals.nlp_signals import NLPQuerySignal
 # from agents.nlp_recommendation_agent import NLPRecommendationAgent
 #
@@ -14,29 +15,110 @@
 #             "recommendations": rec_signal.districts
 #         }
 
+import threading
+
 from langchain_core.runnables import Runnable
 
 from signals.nlp_signals import NLPQuerySignal
 from signals.insight_signals.poverty_insight_signals import InsightQuerySignal
 
 from agents.nlp_recommendation_agent import NLPRecommendationAgent
-from agents.insight_generator_agent import InsightGeneratorAgent
+from agents.insight_generator_agent import InsightGeneratorAgent, shared_insight_generator
+from dataloader.dataset_registry import get_registry
+from utils import tracing
 
 
 class CoordinatorAgent(Runnable):
-    def __init__(self, project_root):
-        self.recommender = NLPRecommendationAgent(project_root)
-        self.insight_generator = InsightGeneratorAgent(project_root)
+    def __init__(self, project_root, **recommender_options):
+        self.project_root = project_root
+        # Passed through to NLPRecommendationAgent (quantized_encoder, precision, dims, shared_memory, ...)
+        self.recommender_options = recommender_options
+        # Every agent reads its data through the same registry, so each workbook is loaded once
+        self.registry = get_registry(project_root)
+        # Agents are built on first use: pages that never ask for insights never load them
+        self._recommender = None
+        self._insight_generator = None
+        self._lock = threading.Lock()
+
+    @property
+    def recommender(self) -> NLPRecommendationAgent:
+        if self._recommender is None:
+            with self._lock:
+                if self._recommender is None:
+                    self._recommender = NLPRecommendationAgent(
+                        self.project_root, registry=self.registry, **self.recommender_options
+                    )
+        return self._recommender
+
+    @property
+    def insight_generator(self) -> InsightGeneratorAgent:
+        if self._insight_generator is None:
+            with self._lock:
+                if self._insight_generator is None:
+                    # Shared with the poverty domain plugin (agents/domain_plugins.py)
+                    self._insight_generator = shared_insight_generator(self.registry)
+        return self._insight_generator
+
+    def reload(self) -> dict:
+        """Re-read changed data files and refresh the agents that have been built so far."""
+        self.registry.reload()
+        report = {"data_version": self.registry.version}
+        if self._recommender is not None:
+            report["recommender"] = self._recommender.reload()
+        if self._insight_generator is not None:
+            shared_insight_generator(self.registry)
+        return report
+
+    def close(self):
+        if self._recommender is not None:
+            self._recommender.close()
+
+    def warmup(self, recommender: bool = True, insights: bool = True):
+        if recommender:
+            self.recommender
+        if insights:
+            self.insight_generator
 
     def invoke(self, user_input: str):
         # Only return recommendations here
         nlp_signal = NLPQuerySignal(preference=user_input)
-        rec_signal = self.recommender.invoke(nlp_signal)
+        with tracing.trace("recommend"):
+            rec_signal = self.recommender.invoke(nlp_signal)
 
-        return {"recommendations": rec_signal.districts}
+        return {"recommendations": rec_signal}
+
+    def batch(self, user_inputs, config=None, **kwargs):
+        signals = [NLPQuerySignal(preference=text) for text in user_inputs]
+        with tracing.trace("recommend.batch"):
+            results = self.recommender.batch(signals)
+        return [{"recommendations": rec} for rec in results]
 
     def get_insights_for_district(self, district: str):
         # Called only when user selects a district
         sig = InsightQuerySignal(district=district)
-        out = self.insight_generator.invoke(sig)
+        with tracing.trace("insights"):
+            out = self.insight_generator.invoke(sig)
         return out.insights
+
+    def get_insights_snapshot(self, district: str):
+        """(data_version, payload) read from one state, so the version always matches the payload."""
+        agent = self.insight_generator
+        state = agent.state
+        with tracing.trace("insights"):
+            return state.data_version, agent.bulk([district], state)[district]
+
+    def get_insights_for_districts(self, districts):
+        with tracing.trace("insights.batch"):
+            return self.insight_generator.bulk(districts)
+
+    def compare_districts(self, districts):
+        with tracing.trace("insights.compare"):
+            return self.insight_generator.compare(districts)
+
+    def get_poverty_trend(self, district: str, start: str = None, end: str = None):
+        with tracing.trace("insights.trend"):
+            return self.insight_generator.trend(district, start, end)
+
+    def top_districts(self, metric: str = "latest", n: int = 10, ascending: bool = False):
+        with tracing.trace("insights.top"):
+            return self.insight_generator.top(metric, n, ascending)
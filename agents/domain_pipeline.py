@@ -0,0 +1,189 @@
+import os
+import threading
+from abc import abstractmethod
+from functools import partial
+from typing import Any, Dict, List, Mapping, NamedTuple
+
+import numpy as np
+import pandas as pd
+from langchain_core.runnables import Runnable
+
+from agents.base_agent import BaseAgent
+from dataloader.dataset_registry import DatasetRegistry, get_registry
+from signals.domain_signals import DomainQuerySignal, DomainRecommendationSignal
+from signals.nlp_signals import RecommendationSignal
+from utils.embedding_store import model_identity
+from utils.payloads import freeze
+from utils.similarity_search import SimilarityIndex
+
+
+class DomainPlugin(BaseAgent):
+    """One domain (poverty, child protection, mental health, ...) plugged into the DomainPipeline.
+
+    A plugin only says how to get its district table, how to turn rows into text for the encoder,
+    and how to build per-district insight payloads. Model, embedding store, index and cache are
+    owned by the pipeline and shared by every plugin.
+    """
+
+    name: str = ""
+    display_columns: List[str] = []
+
+    def available(self, registry: DatasetRegistry) -> bool:
+        return True
+
+    @abstractmethod
+    def load(self, registry: DatasetRegistry) -> pd.DataFrame:
+        """District table with a 'District' column, one row per document to index."""
+
+    @abstractmethod
+    def build_texts(self, df: pd.DataFrame) -> List[str]:
+        pass
+
+    def build_insights(self, registry: DatasetRegistry, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        return {}
+
+    def columns(self, df: pd.DataFrame) -> List[str]:
+        """Metric columns reported with each match; computed per load, never stored on the plugin."""
+        return [c for c in self.display_columns if c in df.columns]
+
+    def run(self, input_data: dict):
+        registry = input_data["registry"]
+        df = self.load(registry)
+        return {
+            "df": df, "texts": self.build_texts(df), "insights": self.build_insights(registry, df),
+            "columns": self.columns(df),
+        }
+
+
+class DomainShard(NamedTuple):
+    df: pd.DataFrame
+    index: SimilarityIndex
+    insights: Mapping[str, Mapping[str, Any]]
+    columns: List[str]
+
+
+class DomainPipeline(Runnable):
+    """Shared encoder + sharded embedding index for every registered domain.
+
+    Each domain is one shard: its own rows in the persisted embedding store (namespace = domain name)
+    and its own SimilarityIndex, all encoded by the single model held in the registry. A query is
+    encoded once (through the shared query cache) and can be scored against any set of shards.
+    """
+
+    def __init__(self, project_root, registry=None, query_cache=None, policy=None, **index_options):
+        self.project_root = project_root
+        self.registry = registry or get_registry(project_root)
+        self.query_cache = query_cache
+        self.policy = policy
+        self.index_options = index_options
+        self.plugins: Dict[str, DomainPlugin] = {}
+        self.shards: Dict[str, DomainShard] = {}
+        self._registered: List[DomainPlugin] = []
+        self._version = self.registry.version
+        self._model_id = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        return self.registry.get("model")
+
+    @property
+    def model_id(self) -> str:
+        if self._model_id is None:
+            self._model_id = model_identity(self.model)
+        return self._model_id
+
+    def register(self, plugin: DomainPlugin) -> bool:
+        self._registered.append(plugin)
+        if not plugin.available(self.registry):
+            return False
+        self.plugins[plugin.name] = plugin
+        return True
+
+    def _build_shard(self, plugin: DomainPlugin) -> DomainShard:
+        model = self.model
+        built = plugin.run({"registry": self.registry})
+        store = self.registry.embedding_store(self.model_id, plugin.name, built["texts"])
+        matrix = store.get_or_encode(
+            built["texts"], lambda batch: model.encode(batch, convert_to_numpy=True, normalize_embeddings=True)
+        )
+        return DomainShard(
+            built["df"], SimilarityIndex(matrix, **self.index_options), freeze(built["insights"]), built["columns"]
+        )
+
+    def _refresh(self):
+        # Any registry reload (reload() below, CoordinatorAgent.reload from the DataWatcher) retires
+        # every shard and re-checks which domains have data; called with self._lock held
+        if self._version != self.registry.version:
+            self._version = self.registry.version
+            self.plugins = {p.name: p for p in self._registered if p.available(self.registry)}
+            self.shards = {}
+
+    def domains(self) -> List[str]:
+        with self._lock:
+            self._refresh()
+            return list(self.plugins)
+
+    def shard(self, name: str) -> DomainShard:
+        shard = self.shards.get(name)
+        if shard is None or self._version != self.registry.version:
+            with self._lock:
+                self._refresh()
+                shard = self.shards.get(name)
+                if shard is None:
+                    shard = self.shards[name] = self._build_shard(self.plugins[name])
+        return shard
+
+    def reload(self) -> dict:
+        """Re-read changed data files; shards are rebuilt from them on next use."""
+        self.registry.reload()
+        with self._lock:
+            self._refresh()
+        return {"data_version": self._version}
+
+    def _encode(self, text: str) -> np.ndarray:
+        def encode(batch):
+            return self.model.encode(batch, convert_to_numpy=True, normalize_embeddings=True)
+
+        if self.policy is not None:
+            encode = partial(self.policy.run, encode)
+        if self.query_cache is None:
+            return encode([text])[0]
+        return self.query_cache.encode(self.model_id, [text], encode)[0]
+
+    def invoke(self, signal: DomainQuerySignal) -> DomainRecommendationSignal:
+        names = signal.domains or self.domains()
+        q = self._encode(signal.preference)
+        results = {}
+        for name in names:
+            shard = self.shard(name)
+            top_idx, scores = shard.index.search(q, k=signal.k)
+            rows = np.asarray(top_idx, dtype=np.int64)
+            results[name] = RecommendationSignal(
+                rows=rows,
+                district=shard.df["District"].to_numpy(dtype=object)[rows],
+                score=np.asarray(scores, dtype=np.float64),
+                metrics={c: shard.df[c].to_numpy()[rows] for c in shard.columns},
+            )
+        return DomainRecommendationSignal(results=results)
+
+    def insights(self, domain: str, district: str):
+        return self.shard(domain).insights.get(district)
+
+
+_pipelines = {}
+_pipelines_lock = threading.Lock()
+
+
+def get_domain_pipeline(project_root: str, query_cache=None, policy=None) -> DomainPipeline:
+    """Process-wide pipeline with the built-in domains registered."""
+    from agents.domain_plugins import default_plugins
+
+    project_root = os.path.abspath(project_root)
+    with _pipelines_lock:
+        if project_root not in _pipelines:
+            pipeline = DomainPipeline(project_root, query_cache=query_cache, policy=policy)
+            for plugin in default_plugins():
+                pipeline.register(plugin)
+            _pipelines[project_root] = pipeline
+        return _pipelines[project_root]
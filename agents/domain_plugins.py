@@ -0,0 +1,87 @@
+import os
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from agents.domain_pipeline import DomainPlugin
+from dataloader.dataset_registry import DatasetRegistry
+from dataloader.insight.child_cases_insights import ChildCasesInsightsDataLoader
+from dataloader.insight.mental_health_insights import build_mental_health_insights
+from dataloader.mental_helalth_data_loader import MentalHealthDataLoader
+from dataloader.poverty_data_loader import PovertyDataLoader
+
+
+def _counts(values: pd.Series) -> pd.Series:
+    # Case counts are floats with NaN for unreported periods; render 434.0 as "434"
+    return values.map(lambda v: "not reported" if v != v else f"{v:g}")
+
+
+class PovertyDomain(DomainPlugin):
+    name = "poverty"
+    display_columns = ["average_poverty_line", "Population"]
+
+    def load(self, registry: DatasetRegistry) -> pd.DataFrame:
+        return PovertyDataLoader(registry.project_root, registry=registry).load()[1]
+
+    def build_texts(self, df: pd.DataFrame) -> List[str]:
+        return df["text"].tolist()
+
+    def build_insights(self, registry: DatasetRegistry, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        from agents.insight_generator_agent import shared_insight_generator
+
+        # The coordinator's agent: the poverty payloads are built once per process
+        return shared_insight_generator(registry).bulk(df["District"])
+
+
+class ChildProtectionDomain(DomainPlugin):
+    name = "child_protection"
+    display_columns = ["total_cases", "latest_cases", "average_cases"]
+
+    def available(self, registry: DatasetRegistry) -> bool:
+        return os.path.exists(registry.path("data", "childcases.xlsx"))
+
+    def load(self, registry: DatasetRegistry) -> pd.DataFrame:
+        return ChildCasesInsightsDataLoader(registry.project_root, registry=registry).load()["summary_df"].reset_index()
+
+    def build_texts(self, df: pd.DataFrame) -> List[str]:
+        return (
+            df["District"] +
+            " Child protection cases: " + _counts(df["total_cases"]) +
+            " Latest: " + _counts(df["latest_cases"])
+        ).tolist()
+
+    def build_insights(self, registry: DatasetRegistry, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        frames = ChildCasesInsightsDataLoader(registry.project_root, registry=registry).load()
+        return {
+            district: {"available": True, "trend": trend.dropna().to_dict(), "provisional": frames["provisional"]}
+            for district, trend in frames["cases_df"].iterrows()
+        }
+
+
+class MentalHealthDomain(DomainPlugin):
+    name = "mental_health"
+
+    def available(self, registry: DatasetRegistry) -> bool:
+        # No mental-health workbook ships yet; the domain switches on once data/mental_health.xlsx exists
+        return MentalHealthDataLoader(registry.project_root, registry=registry).available()
+
+    def load(self, registry: DatasetRegistry) -> pd.DataFrame:
+        return MentalHealthDataLoader(registry.project_root, registry=registry).load()
+
+    def columns(self, df: pd.DataFrame) -> List[str]:
+        # The workbook's own columns: the plugin instance is shared, so they are not kept on it
+        return [c for c in df.columns if c != "District"]
+
+    def build_texts(self, df: pd.DataFrame) -> List[str]:
+        numeric = [c for c in df.columns if c != "District"]
+        return [
+            " ".join([row["District"]] + [f"{c}: {row[c]}" for c in numeric])
+            for row in df.to_dict(orient="records")
+        ]
+
+    def build_insights(self, registry: DatasetRegistry, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        return build_mental_health_insights(df)
+
+
+def default_plugins() -> List[DomainPlugin]:
+    return [PovertyDomain(), ChildProtectionDomain(), MentalHealthDomain()]
@@ -1,57 +1,200 @@
-from typing import Dict, Any
+import threading
+from typing import Dict, Any, Iterable, List, Mapping, NamedTuple, Optional
+import numpy as np
+import pandas as pd
 from langchain_core.runnables import Runnable
 
+from dataloader.district_repository import DEMO_FIELDS, period_axis
 from dataloader.insight.poverty_insights import PovertyInsightsDataLoader
+from entity.district import RankedDistrict
 from signals.insight_signals.poverty_insight_signals import InsightQuerySignal, InsightSignal
+from utils import tracing
+from utils.lru_cache import LRUCache
+from utils.payloads import freeze
+
+# Smoothing windows offered by the poverty dashboard; 1 is the raw series
+SMOOTHING_WINDOWS = (1, 3, 5, 7)
+
+
+def rolling_means(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean of up to `window` points, as Series.rolling(window, min_periods=1).mean()."""
+    c = np.cumsum(values)
+    out = c.copy()
+    out[window:] -= c[:-window]
+    return out / np.minimum(np.arange(1, len(values) + 1), window)
+
+
+class InsightState(NamedTuple):
+    # Everything a request reads, swapped as one object so a reload is never seen half-applied
+    repository: Any
+    stats_df: Optional[pd.DataFrame]
+    index: Mapping[str, Mapping[str, Any]]
+    data_version: int
 
 
 class InsightGeneratorAgent(Runnable):
-    def __init__(self, project_root: str):
-        data = PovertyInsightsDataLoader(project_root).load()
-        self.poverty_df = data["poverty_df"]
-        self.demo_df = data["demo_df"]
+    def __init__(self, project_root: str, registry=None, cache_size: int = 4096):
+        self.loader = PovertyInsightsDataLoader(project_root, registry=registry)
+        self.cache_size = cache_size
+        self.reload()
 
-    def _poverty_insight(self, district: str) -> Dict[str, Any]:
-        if district not in self.poverty_df.index:
-            return {"available": False, "trend": {}, "latest": None}
+    def reload(self):
+        # Read the version before the data: if the files change meanwhile, the next check rebuilds again
+        version = self.loader.registry.version
+        repository = self.loader.repository()
+        prebuilt = self.loader.prebuilt()
+        if prebuilt is not None:
+            stats_df = prebuilt["stats"]
+            index = {district: freeze(payload) for district, payload in prebuilt["index"].items()}
+        elif not repository.in_memory:
+            # SQLite backend: payloads are built per request from indexed queries, recent ones kept
+            stats_df = None
+            index = LRUCache(self.cache_size)
+        else:
+            with tracing.span("insights.build"):
+                # Cross-district statistics depend on every district, so compute them once per data version
+                stats_df = repository.poverty_stats()
+                index = self._build_payloads(repository)
+        self._state = InsightState(repository, stats_df, index, version)
 
-        s = self.poverty_df.loc[district].dropna()
-        if s.empty:
-            return {"available": True, "trend": {}, "latest": None}
+    @property
+    def state(self) -> InsightState:
+        return self._state
 
-        return {
-            "available": True,
-            "trend": s.to_dict(),
-            "latest": float(s.iloc[-1]),
-            "latest_period": str(s.index[-1]),
-        }
+    @property
+    def repository(self):
+        return self._state.repository
 
-    def _demo_insight(self, district: str) -> Dict[str, Any]:
-        # Adjust keys here to match your demographic columns
-        if "DISTRICT_N" not in self.demo_df.columns:
-            return {"available": False, "row": {}}
+    @property
+    def stats_df(self) -> Optional[pd.DataFrame]:
+        return self._state.stats_df
 
-        row = self.demo_df[self.demo_df["DISTRICT_N"] == district]
-        if row.empty:
-            return {"available": False, "row": {}}
+    @property
+    def index(self) -> Mapping[str, Mapping[str, Any]]:
+        return self._state.index
 
-        r = row.iloc[0].to_dict()
+    @property
+    def data_version(self) -> int:
+        return self._state.data_version
 
-        # Optional: pick a few common fields if present
-        picked = {}
-        for key in ["TOT_POP", "MALE", "FEMALE", "POP_DENSITY", "AREA"]:
-            if key in r:
-                picked[key] = r[key]
+    def _poverty_insights(self, poverty_df, stats_df, districts_ranked: int) -> Dict[str, Dict[str, Any]]:
+        out = {}
+        stats = stats_df.to_dict(orient="index")
+        # Chart series: chronological x and numeric values, every smoothing window precomputed
+        axis, x, order = period_axis(list(poverty_df.columns))
+        numeric = poverty_df.iloc[:, order].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+        x = np.asarray(x, dtype=object)[order]
+        for i, (district, row) in enumerate(poverty_df.iterrows()):
+            valid = ~np.isnan(numeric[i])
+            values = numeric[i][valid]
+            series = {
+                "axis": axis,
+                "x": tuple(x[valid].tolist()),
+                "smoothed": {w: tuple(rolling_means(values, w).tolist()) for w in SMOOTHING_WINDOWS},
+            }
+            s = row.dropna()
+            if s.empty:
+                out[district] = {"available": True, "trend": {}, "latest": None, "series": series}
+                continue
+            st = stats[district]
+            out[district] = {
+                "available": True,
+                "trend": s.to_dict(),
+                "series": series,
+                "latest": float(s.iloc[-1]),
+                "latest_period": str(s.index[-1]),
+                "first_period": str(s.index[0]),
+                "change": None if s.size < 2 else float(st["change"]),
+                "growth_rate": None if s.size < 2 or pd.isna(st["growth_rate"]) else float(st["growth_rate"]),
+                "rank": int(st["rank"]),
+                "percentile": float(st["percentile"]),
+                "districts_ranked": districts_ranked,
+            }
+        return out
 
-        return {"available": True, "row": picked or r}
+    def _demo_insights(self, demo_df) -> Dict[str, Dict[str, Any]]:
+        # Payloads carry DEMO_FIELDS only (all declared in dataloader/schemas.DEMOGRAPHICS)
+        rows = demo_df[[c for c in DEMO_FIELDS if c in demo_df.columns]].to_dict(orient="index")
+        return {district: {"available": True, "row": row} for district, row in rows.items()}
 
-    def invoke(self, signal: InsightQuerySignal) -> InsightSignal:
-        district = signal.district
+    def _build_payloads(self, repo, districts=None) -> Dict[str, Mapping[str, Any]]:
+        """Payloads for the given districts (all of them if None), each filter applied by the repository."""
+        poverty = self._poverty_insights(
+            repo.poverty_lines(districts), repo.poverty_stats(districts), repo.districts_ranked()
+        )
+        demo = self._demo_insights(repo.demographics(districts))
+        index = {}
+        for district in list(poverty) + [d for d in demo if d not in poverty]:
+            # Payloads are shared by every caller, so hand out read-only mappings
+            index[district] = freeze({
+                "district": district,
+                "poverty": poverty.get(district, {"available": False, "trend": {}, "latest": None}),
+                "demographics": demo.get(district, {"available": False, "row": {}}),
+            })
+        return index
 
-        insights = {
+    def _missing(self, district: str) -> Mapping[str, Any]:
+        return freeze({
             "district": district,
-            "poverty": self._poverty_insight(district),
-            "demographics": self._demo_insight(district),
-        }
+            "poverty": {"available": False, "trend": {}, "latest": None},
+            "demographics": {"available": False, "row": {}},
+        })
+
+    def bulk(self, districts: Iterable[str], state: InsightState = None) -> Dict[str, Mapping[str, Any]]:
+        """Insights for many districts at once: one lookup each, misses fetched in one batch.
+
+        Pass a state (from .state) to read payloads of the same snapshot as its data_version.
+        """
+        districts = list(districts)
+        state = state or self._state
+        index = state.index
+        out = {d: index.get(d) for d in districts}
+        missing = [d for d, payload in out.items() if payload is None]
+        if missing and isinstance(index, LRUCache):
+            built = self._build_payloads(state.repository, missing)
+            for d in missing:
+                out[d] = built.get(d) or self._missing(d)
+                index.put(d, out[d])
+        return {d: payload or self._missing(d) for d, payload in out.items()}
+
+    def compare(self, districts: Iterable[str]) -> pd.DataFrame:
+        """Cross-district statistics table (one row per district, in the given order)."""
+        districts = list(districts)
+        state = self._state
+        stats = state.stats_df if state.stats_df is not None else state.repository.poverty_stats(districts)
+        return stats.reindex(districts)
 
+    def trend(self, district: str, start: str = None, end: str = None) -> Dict[str, Any]:
+        """Poverty lines of one district between two periods (inclusive)."""
+        lines = self.repository.poverty_lines([district], start, end)
+        return {} if lines.empty else lines.iloc[0].dropna().to_dict()
+
+    def top(self, metric: str = "latest", n: int = 10, ascending: bool = False) -> List[RankedDistrict]:
+        return self.repository.top(metric, n, ascending)
+
+    def invoke(self, signal: InsightQuerySignal) -> InsightSignal:
+        district = signal.district
+        with tracing.span("insights.lookup"):
+            insights = self.bulk([district])[district]
         return InsightSignal(district=district, insights=insights)
+
+
+_reload_lock = threading.Lock()
+
+
+def shared_insight_generator(registry) -> InsightGeneratorAgent:
+    """The registry's one InsightGeneratorAgent, brought up to its data version.
+
+    The coordinator and the poverty domain plugin both serve these payloads; sharing the agent
+    through the registry builds them once per process and data version instead of once per caller.
+    """
+    registry.register(
+        "insight_generator", lambda r: InsightGeneratorAgent(r.project_root, registry=r), reloadable=False
+    )
+    agent = registry.get("insight_generator")
+    if agent.data_version != registry.version:
+        with _reload_lock:
+            # Concurrent callers wait for one rebuild instead of each running their own
+            if agent.data_version != registry.version:
+                agent.reload()
+    return agent
@@ -1,21 +1,220 @@
-import torch
+from functools import partial
+from typing import Dict, NamedTuple
+import numpy as np
+import pandas as pd
 from langchain_core.runnables import Runnable
+from agents.structured_preferences import StructuredScorer, parse_preference
 from dataloader.poverty_data_loader import PovertyDataLoader
 from signals.nlp_signals import NLPQuerySignal, RecommendationSignal
+from utils import tracing
+from utils.embedding_store import model_identity, text_key
+from utils.shared_matrix import release
+from utils.similarity_search import SimilarityIndex, top_k
+
+
+class CorpusState(NamedTuple):
+    # Everything a request reads, swapped as one object so a reload is never seen half-applied
+    df: pd.DataFrame
+    index: SimilarityIndex
+    data_key: str
+    scorer: StructuredScorer
+    # Result columns as arrays, gathered by row index per request instead of slicing the frame
+    district: np.ndarray
+    metrics: Dict[str, np.ndarray]
+
+
+# Corpus columns carried in every RecommendationSignal next to the district and score
+RESULT_METRICS = ("average_poverty_line",)
+
+
+def _readonly(values: np.ndarray) -> np.ndarray:
+    # Signals are shared through the result cache
+    values.flags.writeable = False
+    return values
+
 
 class NLPRecommendationAgent(Runnable):
-    def __init__(self, project_root):
-        self.model, self.df = PovertyDataLoader(project_root).load()
-        self.embeddings = self.model.encode(self.df['text'].tolist(), convert_to_tensor=True)
+    def __init__(self, project_root, backend="auto", approx_threshold=None, registry=None,
+                 quantized_encoder=False, precision="float32", dims=None, shared_memory=False, query_cache=None,
+                 semantic_weight=0.5, policy=None):
+        self.loader = PovertyDataLoader(project_root, registry=registry)
+        self.model, df = self.loader.load()
+        self.data_version = self.loader.registry.version
+        # Corpus vectors always come from the fp32 model; quantization only speeds up queries
+        self.query_model = self.loader.registry.get("query_model_int8") if quantized_encoder else self.model
+        self.model_id = model_identity(self.model)
+        self.query_model_id = self.model_id + (":int8" if quantized_encoder else "")
+        # Optional service.query_cache.QueryCache shared with the service's result cache
+        self.query_cache = query_cache
+        # Optional service.execution_policy.ExecutionPolicy: query forward passes run on its bounded pool
+        self.policy = policy
+        self.index_options = dict(backend=backend, approx_threshold=approx_threshold, precision=precision, dims=dims)
+        self.shared_memory = shared_memory
+        # Share of the semantic score when a preference also has numeric terms ("low poverty")
+        self.semantic_weight = semantic_weight
+        self._state = self._build_state(df)
+
+    def _build_state(self, df) -> CorpusState:
+        texts = df['text'].tolist()
+        # Identifies encoder + corpus contents: cached results are only valid for the same key
+        data_key = text_key(self.model_id + "".join(text_key(t) for t in texts))[:16]
+        # Only rows whose text changed since the last run go through the encoder
+        store = self.loader.registry.embedding_store(self.model_id, "poverty", texts)
+        matrix = store.get_or_encode(
+            texts, lambda batch: self.model.encode(batch, convert_to_numpy=True, normalize_embeddings=True)
+        )
+        # Multi-worker servers: every worker attaches to one copy of the corpus matrix
+        shared_name = self._shared_name(data_key) if self.shared_memory else None
+        index = SimilarityIndex(matrix, shared_name=shared_name, **self.index_options)
+        return CorpusState(
+            df, index, data_key, StructuredScorer(df),
+            df['District'].to_numpy(dtype=object),
+            {name: df[name].to_numpy(dtype=np.float64) for name in RESULT_METRICS},
+        )
+
+    def _shared_name(self, data_key: str) -> str:
+        # One segment per corpus version and index layout
+        return f"poverty_{data_key}_{self.index_options['precision']}_{self.index_options['dims']}"
+
+    def close(self):
+        """Detach from the shared-memory corpus (server shutdown); its creator also unlinks it."""
+        if self.shared_memory:
+            release(self._shared_name(self._state.data_key), unlink=True)
+
+    @property
+    def df(self) -> pd.DataFrame:
+        return self._state.df
+
+    @property
+    def index(self) -> SimilarityIndex:
+        return self._state.index
+
+    @property
+    def data_key(self) -> str:
+        return self._state.data_key
+
+    @property
+    def result_key(self) -> str:
+        """data_key plus everything else a ranking depends on: query encoder, index layout, score blend.
+
+        Agents with different options can share one result cache without serving each other's results.
+        """
+        options = sorted(self.index_options.items()) + [("semantic_weight", self.semantic_weight)]
+        return self._state.data_key + text_key(self.query_model_id + repr(options))[:16]
+
+    def reload(self) -> dict:
+        """Rebuild from the registry's current data and swap it in while requests keep running.
+
+        Only texts that were not embedded before are encoded, so the cost follows the size of the change.
+        """
+        _, df = self.loader.load()
+        old = self._state.df
+        old_text = dict(zip(old['District'], old['text']))
+        new_text = dict(zip(df['District'], df['text']))
+        diff = {
+            "added": sorted(set(new_text) - set(old_text)),
+            "removed": sorted(set(old_text) - set(new_text)),
+            "changed": sorted(d for d in set(new_text) & set(old_text) if new_text[d] != old_text[d]),
+        }
+        if any(diff.values()) or len(df) != len(old):
+            previous = self._state.data_key
+            self._state = self._build_state(df)
+            if self.shared_memory and previous != self._state.data_key:
+                # Requests already holding the old state keep their mapping; the creator drops the name
+                release(self._shared_name(previous), unlink=True)
+        self.data_version = self.loader.registry.version
+        return diff
+
+    def _mask(self, state, signal, pref):
+        mask = state.scorer.mask(pref)
+        if signal.districts:
+            districts = state.df['District'].isin(signal.districts).to_numpy()
+            mask = districts if mask is None else mask & districts
+        return mask
+
+    def _query_text(self, signal, pref):
+        # Parsed phrases are scored on the columns; only the rest of the text goes to the encoder
+        return pref.residual if pref.is_structured else signal.preference
+
+    def _rank(self, state, signal, pref, q):
+        """(row indices, scores) of the top signal.k rows."""
+        mask = self._mask(state, signal, pref)
+        if not pref.terms and q is not None:
+            return state.index.search(q, k=signal.k, mask=mask)
+
+        if pref.terms:
+            scores = state.scorer.scores(pref)
+        else:
+            # Filters only ("population over 300000"): rank the matches by the filtered columns
+            scores = state.scorer.filter_scores(pref)
+        if q is not None:
+            semantic = (state.index.scores(q) + 1.0) / 2.0
+            scores = self.semantic_weight * semantic + (1.0 - self.semantic_weight) * scores
+        rows = top_k(scores, signal.k) if mask is None else np.flatnonzero(mask)[top_k(scores[mask], signal.k)]
+        return rows, scores[rows]
+
+    def _to_signal(self, state, top) -> RecommendationSignal:
+        rows, scores = top
+        rows = np.asarray(rows, dtype=np.int64)
+        return RecommendationSignal(
+            rows=_readonly(rows),
+            district=_readonly(state.district[rows]),
+            score=_readonly(np.asarray(scores, dtype=np.float64)),
+            metrics={name: _readonly(values[rows]) for name, values in state.metrics.items()},
+        )
+
+    def _encode_queries(self, texts) -> np.ndarray:
+        def encode(batch):
+            return self.query_model.encode(batch, convert_to_numpy=True, normalize_embeddings=True)
+
+        if self.policy is not None:
+            encode = partial(self.policy.run, encode)
+        if self.query_cache is None:
+            return encode(texts)
+        return self.query_cache.encode(self.query_model_id, texts, encode)
 
     def invoke(self, signal: NLPQuerySignal) -> RecommendationSignal:
-        with torch.no_grad():
-            q = self.model.encode(signal.preference, convert_to_tensor=True, normalize_embeddings=True)
+        state = self._state
+        with tracing.span("recommender.parse"):
+            pref = parse_preference(signal.preference)
+        # Fully structured preferences ("low poverty, high population") never touch the transformer
+        q = None
+        if not pref.fully_structured:
+            with tracing.span("recommender.encode"):
+                q = self._encode_queries([self._query_text(signal, pref)])[0]
 
-        scores = torch.matmul(q, self.embeddings.T).cpu().numpy()
-        top_idx = scores.argsort()[-10:][::-1]
+        with tracing.span("recommender.search"):
+            top = self._rank(state, signal, pref, q)
 
-        districts = self.df.iloc[top_idx][['District','average_poverty_line']].to_dict(orient="records")
+        with tracing.span("recommender.collect"):
+            return self._to_signal(state, top)
 
-        return RecommendationSignal(districts=districts)
+    def batch(self, signals, config=None, **kwargs):
+        """Encode all preferences in one forward pass and score them with one matrix multiply."""
+        if not signals:
+            return []
+        state = self._state
+        with tracing.span("recommender.parse"):
+            prefs = [parse_preference(s.preference) for s in signals]
+        needs_encoder = [i for i, p in enumerate(prefs) if not p.fully_structured]
+        queries = {}
+        if needs_encoder:
+            with tracing.span("recommender.encode"):
+                Q = self._encode_queries([self._query_text(signals[i], prefs[i]) for i in needs_encoder])
+            queries = dict(zip(needs_encoder, Q))
 
+        top = {}
+        plain = [i for i in needs_encoder if not prefs[i].is_structured]
+        with tracing.span("recommender.search"):
+            if plain:
+                results = state.index.search_many(
+                    np.stack([queries[i] for i in plain]),
+                    k=max(signals[i].k for i in plain),
+                    masks=[self._mask(state, signals[i], prefs[i]) for i in plain],
+                )
+                top.update({i: (idx[:signals[i].k], sc[:signals[i].k]) for i, (idx, sc) in zip(plain, results)})
+            for i, (signal, pref) in enumerate(zip(signals, prefs)):
+                if i not in top:
+                    top[i] = self._rank(state, signal, pref, queries.get(i))
+        with tracing.span("recommender.collect"):
+            return [self._to_signal(state, top[i]) for i in range(len(signals))]
@@ -0,0 +1,141 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Phrase -> merged_df column. Longest alternatives first so "poverty line" wins over "poverty".
+ATTRIBUTES = {
+    "poverty lines": "average_poverty_line",
+    "poverty line": "average_poverty_line",
+    "poverty": "average_poverty_line",
+    "population": "Population",
+    "populated": "Population",
+    "people": "Population",
+}
+
+DIRECTIONS = {
+    **dict.fromkeys(["low", "lower", "lowest", "less", "least", "min", "minimum", "small", "smaller",
+                     "few", "fewer", "sparse", "sparsely"], -1),
+    **dict.fromkeys(["high", "higher", "highest", "more", "most", "max", "maximum", "large", "larger",
+                     "big", "bigger", "many", "dense", "densely"], 1),
+}
+
+OPERATORS = {
+    "above": ">", "over": ">", "greater than": ">", "more than": ">", "at least": ">=", ">=": ">=", ">": ">",
+    "below": "<", "under": "<", "less than": "<", "at most": "<=", "<=": "<=", "<": "<",
+}
+
+# "not high poverty" means low poverty: a negation right before a phrase flips it
+NEGATIONS = ["not", "no", "without", "avoid", "avoiding", "never"]
+NEGATED_OPERATORS = {">": "<=", ">=": "<", "<": ">=", "<=": ">"}
+
+UNITS = {"k": 1e3, "thousand": 1e3, "m": 1e6, "mn": 1e6, "million": 1e6}
+
+# Words that carry no preference on their own; a query made only of these plus parsed phrases is fully structured
+FILLER = {"and", "with", "or", "a", "an", "the", "in", "of", "that", "have", "has", "area", "areas",
+          "district", "districts", "region", "regions", "place", "places", "level", "levels", "but"}
+
+_attr = "|".join(re.escape(a) for a in ATTRIBUTES)
+_dir = "|".join(sorted(DIRECTIONS, key=len, reverse=True))
+_op = "|".join(re.escape(o) for o in sorted(OPERATORS, key=len, reverse=True))
+
+_FILTER_RE = re.compile(
+    rf"\b(?P<attr>{_attr})\s+(?:is\s+|of\s+)?(?P<op>{_op})\s*(?P<num>\d[\d,]*(?:\.\d+)?)\s*(?P<unit>k|mn|m|thousand|million)?\b"
+)
+_TERM_RE = re.compile(rf"\b(?P<dir>{_dir})\s+(?P<attr>{_attr})\b")
+_TERM_REVERSED_RE = re.compile(rf"\b(?P<attr>{_attr})\s+(?:is\s+|of\s+)?(?P<dir>{_dir})\b")
+_TOKEN_RE = re.compile(r"[a-z0-9]+", re.IGNORECASE)
+_NEGATION_RE = re.compile(rf"\b(?:{'|'.join(NEGATIONS)})\s+$")
+
+
+@dataclass
+class StructuredPreference:
+    terms: List[Tuple[str, int]] = field(default_factory=list)            # (column, +1 high / -1 low)
+    filters: List[Tuple[str, str, float]] = field(default_factory=list)   # (column, operator, value)
+    residual: str = ""                                                    # text left for the encoder
+
+    @property
+    def is_structured(self) -> bool:
+        return bool(self.terms or self.filters)
+
+    @property
+    def fully_structured(self) -> bool:
+        return self.is_structured and not self.residual
+
+
+def parse_preference(text: str) -> StructuredPreference:
+    """Pull numeric preferences ("low poverty", "population over 1m") out of free text."""
+    original = text
+    text = text.lower()
+    out = StructuredPreference()
+    spans = []
+
+    def negated(m):
+        # The negation word is consumed with the phrase so it does not reach the encoder either
+        neg = _NEGATION_RE.search(text, 0, m.start())
+        spans.append((neg.start() if neg else m.start(), m.end()))
+        return neg is not None
+
+    for m in _FILTER_RE.finditer(text):
+        value = float(m["num"].replace(",", "")) * UNITS.get(m["unit"] or "", 1)
+        op = OPERATORS[m["op"]]
+        out.filters.append((ATTRIBUTES[m["attr"]], NEGATED_OPERATORS[op] if negated(m) else op, value))
+
+    for regex in (_TERM_RE, _TERM_REVERSED_RE):
+        for m in regex.finditer(text):
+            if any(s <= m.start() < e for s, e in spans):
+                continue
+            direction = DIRECTIONS[m["dir"]]
+            out.terms.append((ATTRIBUTES[m["attr"]], -direction if negated(m) else direction))
+
+    # Matching is case-insensitive, but the residual keeps the user's casing for the encoder
+    # (lower() can change the length of some non-ASCII text; then the lowered text is used)
+    rest = original if len(original) == len(text) else text
+    for s, e in sorted(spans, reverse=True):
+        rest = rest[:s] + " " + rest[e:]
+    out.residual = " ".join(t for t in _TOKEN_RE.findall(rest) if t.lower() not in FILLER)
+    return out
+
+
+class StructuredScorer:
+    """Min-max normalized numeric columns of the corpus, built once per data version."""
+
+    def __init__(self, df: pd.DataFrame, columns=("average_poverty_line", "Population")):
+        self.raw: Dict[str, np.ndarray] = {}
+        self.norm: Dict[str, np.ndarray] = {}
+        for col in columns:
+            if col not in df.columns:
+                continue
+            values = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64)
+            lo, hi = np.nanmin(values), np.nanmax(values)
+            span = hi - lo if hi > lo else 1.0
+            self.raw[col] = values
+            self.norm[col] = np.nan_to_num((values - lo) / span, nan=0.0).astype(np.float32)
+        self.n = len(df)
+
+    def scores(self, pref: StructuredPreference) -> np.ndarray:
+        """Mean over terms of each row's normalized column value (flipped for "low"), in [0, 1]."""
+        terms = [(c, d) for c, d in pref.terms if c in self.norm]
+        if not terms:
+            return np.zeros(self.n, dtype=np.float32)
+        total = np.zeros(self.n, dtype=np.float32)
+        for col, direction in terms:
+            total += self.norm[col] if direction > 0 else 1.0 - self.norm[col]
+        return total / len(terms)
+
+    def filter_scores(self, pref: StructuredPreference) -> np.ndarray:
+        """Filters read as terms: "over"/"at least" ranks the highest values first, "under" the lowest."""
+        terms = [(col, 1 if op.startswith(">") else -1) for col, op, _ in pref.filters]
+        return self.scores(StructuredPreference(terms=terms))
+
+    def mask(self, pref: StructuredPreference):
+        filters = [f for f in pref.filters if f[0] in self.raw]
+        if not filters:
+            return None
+        mask = np.ones(self.n, dtype=bool)
+        for col, op, value in filters:
+            values = self.raw[col]
+            mask &= {">": values > value, ">=": values >= value, "<": values < value, "<=": values <= value}[op]
+        return mask
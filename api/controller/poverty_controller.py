@@ -1,14 +1,114 @@
-# from fastapi import APIRouter
-# from pydantic import BaseModel
-# from agents.coordinator_agent import CoordinatorAgent
-#
-# router = APIRouter()
-# coordinator = CoordinatorAgent()
-#
-# class PreferenceInput(BaseModel):
-#     preference: str
-#
-# @router.post("/recommend")
-# def recommend_regions(input: PreferenceInput):
-#     regions = coordinator.get_recommendations(input.preference)
-#     return {"top_regions": regions}
\ No newline at end of file
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel
+
+from service.execution_policy import Overloaded
+from service.recommendation_service import RecommendationService
+from utils import tracing
+from utils.payloads import thaw
+
+router = APIRouter()
+# shared_memory: all uvicorn workers attach to one copy of the corpus embedding matrix
+service = RecommendationService(shared_memory=True)
+# Blocking service calls leave the event loop here; forward passes themselves are bounded and
+# queued by service.policy (DSGP_ENCODER_WORKERS), which sheds load with Overloaded -> 503
+executor = ThreadPoolExecutor(
+    # DSGP_ENCODER_THREADS is the name the original release notes used; still honoured
+    max_workers=int(os.environ.get("DSGP_OFFLOAD_THREADS") or os.environ.get("DSGP_ENCODER_THREADS") or "32"),
+    thread_name_prefix="offload",
+)
+
+MAX_BATCH = 256
+
+
+class PreferenceInput(BaseModel):
+    preference: str
+
+
+class BatchPreferenceInput(BaseModel):
+    preferences: List[str]
+
+
+class DistrictsInput(BaseModel):
+    districts: List[str]
+
+
+async def _offload(fn, *args):
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+    except Overloaded as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "1"})
+
+
+@router.post("/recommend")
+async def recommend_regions(input: PreferenceInput):
+    result = await _offload(service.get_recommendations, input.preference)
+    # Columnar: {"row": [...], "District": [...], "average_poverty_line": [...], "score": [...]}
+    return {"top_regions": result["recommendations"].to_columns()}
+
+
+@router.post("/recommend/batch")
+async def recommend_regions_batch(input: BatchPreferenceInput):
+    if len(input.preferences) > MAX_BATCH:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH} preferences per batch")
+    results = await _offload(service.get_recommendations_many, input.preferences)
+    return {"results": [{"top_regions": r["recommendations"].to_columns()} for r in results]}
+
+
+@router.get("/insights/{district}")
+async def district_insights(district: str):
+    insights = await _offload(service.get_insights, district)
+    if not insights["poverty"]["available"] and not insights["demographics"]["available"]:
+        raise HTTPException(status_code=404, detail=f"No data for district '{district}'")
+    return thaw(insights)
+
+
+@router.get("/insights/{district}/trend")
+async def district_trend(district: str, start: Optional[str] = None, end: Optional[str] = None):
+    try:
+        trend = await _offload(service.get_poverty_trend, district, start, end)
+    except KeyError as exc:
+        raise HTTPException(status_code=400, detail=exc.args[0])
+    if not trend:
+        raise HTTPException(status_code=404, detail=f"No poverty lines for district '{district}'")
+    return {"district": district, "trend": thaw(trend)}
+
+
+@router.get("/districts/top")
+async def top_districts(metric: str = "latest", n: int = 10, ascending: bool = False):
+    n = min(max(n, 1), MAX_BATCH)
+    try:
+        ranked = await _offload(service.get_top_districts, metric, n, ascending)
+    except KeyError as exc:
+        raise HTTPException(status_code=400, detail=exc.args[0])
+    return {"metric": metric, "districts": [asdict(r) for r in ranked]}
+
+
+@router.post("/insights/batch")
+async def district_insights_batch(input: DistrictsInput):
+    if len(input.districts) > MAX_BATCH:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH} districts per batch")
+    insights = await _offload(service.get_insights_many, input.districts)
+    return {"insights": thaw(insights)}
+
+
+@router.get("/cache/stats")
+async def cache_stats():
+    return service.cache_stats()
+
+
+@router.get("/execution/stats")
+async def execution_stats():
+    return service.execution_stats()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    # Prometheus exposition format; stage histograms (except encoder queue waits) are filled only when DSGP_TRACING=1
+    return tracing.prometheus_text()
@@ -1,5 +1,39 @@
-# from fastapi import FastAPI
-# from api.controller.poverty_controller import router  # ← Full correct path
-#
-# app = FastAPI(title="DSGP Multi-Agent Recommendation System")
-# app.include_router(router, prefix="/api")
\ No newline at end of file
+import os
+from contextlib import asynccontextmanager
+
+import pandas as pd
+from fastapi import FastAPI
+from api.controller.poverty_controller import router, service, executor  # ← Full correct path
+
+# Process-wide pandas option, set here by the entry point: the dataset registry hands out shallow
+# views of shared frames and copy-on-write keeps in-place edits from leaking between requests
+pd.set_option("mode.copy_on_write", True)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the model and attach the shared index while the worker already accepts connections
+    service.warmup(background=True)
+    if os.environ.get("DSGP_WATCH_DATA") == "1":
+        # Pick up corrected workbooks without restarting the workers
+        service.start_watcher()
+    yield
+    executor.shutdown(wait=False)
+    service.policy.shutdown(wait=False)
+    # Detach from the shared corpus segment; the worker that created it also unlinks it from /dev/shm
+    service.close()
+
+
+app = FastAPI(title="DSGP Multi-Agent Recommendation System", lifespan=lifespan)
+app.include_router(router, prefix="/api")
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # Each worker is its own process; they share the embedding matrix through shared memory
+    workers = int(os.environ.get("DSGP_WORKERS", str(os.cpu_count() or 1)))
+    # Split the cores between every encoder thread of every process (inherited by the workers)
+    encoders = workers * int(os.environ.get("DSGP_ENCODER_WORKERS", "2"))
+    os.environ.setdefault("DSGP_TORCH_THREADS", str(max(1, (os.cpu_count() or 1) // encoders)))
+    uvicorn.run("app:app", host="0.0.0.0", port=int(os.environ.get("PORT", "8000")), workers=workers)
@@ -0,0 +1,105 @@
+import glob
+import json
+import os
+import pickle
+
+import pandas as pd
+
+from utils.excel_snapshot import file_hash
+
+ARTIFACTS_DIR = "artifacts"
+CURRENT = "CURRENT"
+# Bump when the on-disk layout or the meaning of a stored frame changes; older builds are then
+# ignored instead of misread
+FORMAT = 5
+
+
+def source_fingerprints(project_root: str) -> dict:
+    """size, mtime and sha256 of every workbook under data/, keyed by file name."""
+    out = {}
+    for path in sorted(glob.glob(os.path.join(project_root, "data", "*.xlsx"))):
+        st = os.stat(path)
+        out[os.path.basename(path)] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": file_hash(path)}
+    return out
+
+
+def write_dataset(out_dir: str, name: str, value) -> dict:
+    """Persist one registry dataset and return its manifest entry (frames as Parquet, anything else pickled)."""
+    if isinstance(value, pd.DataFrame):
+        file_name = f"{name}.parquet"
+        try:
+            value.to_parquet(os.path.join(out_dir, file_name))
+            return {"kind": "parquet", "file": file_name}
+        except (ImportError, ValueError, TypeError):
+            # No pyarrow or non-string column labels
+            pass
+    file_name = f"{name}.pkl"
+    with open(os.path.join(out_dir, file_name), "wb") as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return {"kind": "pickle", "file": file_name}
+
+
+def read_dataset(out_dir: str, entry: dict):
+    path = os.path.join(out_dir, entry["file"])
+    if entry["kind"] == "parquet":
+        return pd.read_parquet(path, memory_map=True)
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+class ArtifactSet:
+    """One finished build of script/build_artifacts.py, as pointed to by artifacts/CURRENT.
+
+    Datasets are only served while every source workbook still matches the manifest; once a
+    workbook changes (hot reload) the registry falls back to its regular loaders.
+    """
+
+    def __init__(self, project_root: str, path: str, manifest: dict):
+        self.project_root = project_root
+        self.dir = path
+        self.manifest = manifest
+        self.datasets = manifest["datasets"]
+        self._checked = {}
+
+    @classmethod
+    def current(cls, project_root: str):
+        if os.environ.get("DSGP_ARTIFACTS") == "0":
+            return None
+        root = os.path.join(project_root, ARTIFACTS_DIR)
+        try:
+            with open(os.path.join(root, CURRENT)) as f:
+                path = os.path.join(root, f.read().strip())
+            with open(os.path.join(path, "manifest.json")) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("format") != FORMAT:
+            return None
+        return cls(project_root, path, manifest)
+
+    def path(self, *parts: str) -> str:
+        return os.path.join(self.dir, *parts)
+
+    def fresh(self) -> bool:
+        for name, source in self.manifest["sources"].items():
+            try:
+                st = os.stat(os.path.join(self.project_root, "data", name))
+            except OSError:
+                return False
+            if st.st_size == source["size"] and st.st_mtime_ns == source["mtime_ns"]:
+                continue
+            # Same content with a new mtime (fresh checkout, copied deploy): hash once per stat signature
+            key = (name, st.st_size, st.st_mtime_ns)
+            if key not in self._checked:
+                self._checked[key] = file_hash(os.path.join(self.project_root, "data", name)) == source["sha256"]
+            if not self._checked[key]:
+                return False
+        return True
+
+    def read(self, name: str):
+        return read_dataset(self.dir, self.datasets[name])
+
+    def loader(self, name: str, fallback):
+        def load(registry):
+            return self.read(name) if self.fresh() else fallback(registry)
+        return load
@@ -0,0 +1,148 @@
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Set
+
+import numpy as np
+import pandas as pd
+
+from dataloader.dataset_registry import get_registry
+
+_YEAR_RE = re.compile(r"^\s*((?:19|20)\d{2})(?:\.0+)?\s*(\*?)\s*$")
+_DATE_HEADERS = ("year", "date", "period", "reported", "month")
+_COUNT_HEADERS = ("cases", "count", "number")
+
+
+def _period(value):
+    """'2010', 2010, 2023.0, '2024*' -> ('2010', provisional?) or None for anything else."""
+    if value is None or isinstance(value, bool):
+        return None
+    if hasattr(value, "year"):
+        return str(value.year), False
+    m = _YEAR_RE.match(str(value))
+    return (m.group(1), bool(m.group(2))) if m else None
+
+
+def _number(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return None if value != value else value
+    try:
+        return float(str(value).replace(",", ""))
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class ChildCaseAggregates:
+    """Case counts per (district, period), accumulated row by row without keeping the rows."""
+
+    district_ids: Dict[str, int] = field(default_factory=dict)
+    period_ids: Dict[str, int] = field(default_factory=dict)
+    provisional: Set[str] = field(default_factory=set)
+    rows_read: int = 0
+    _counts: Dict[tuple, float] = field(default_factory=dict)
+
+    def add(self, district: str, period: str, cases: float = 1):
+        d = self.district_ids.setdefault(district, len(self.district_ids))
+        p = self.period_ids.setdefault(period, len(self.period_ids))
+        self._counts[(d, p)] = self._counts.get((d, p), 0) + cases
+
+    @property
+    def districts(self) -> List[str]:
+        return list(self.district_ids)
+
+    @property
+    def periods(self) -> List[str]:
+        return sorted(self.period_ids)
+
+    def matrix(self) -> np.ndarray:
+        """Dense (district x period) count matrix, periods in sorted order; NaN where nothing was reported."""
+        order = {self.period_ids[p]: i for i, p in enumerate(self.periods)}
+        out = np.full((len(self.district_ids), len(self.period_ids)), np.nan)
+        for (d, p), cases in self._counts.items():
+            out[d, order[p]] = cases
+        return out
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.matrix(), index=pd.Index(self.districts, name="District"), columns=self.periods)
+
+
+class ChildCaseDataLoader:
+    """Streams data/childcases.xlsx through openpyxl's read-only mode.
+
+    Two layouts are understood:
+    - wide: one row per district with a header row of years (the NCPA summary table that ships today)
+    - long: one row per case (or per district/period) with a District column and a year/date column,
+      plus an optional cases/count column
+
+    Peak memory depends on the number of districts and periods, not on the number of rows.
+    """
+
+    def __init__(self, project_root, registry=None, file_name="childcases.xlsx"):
+        self.project_root = project_root
+        self.path = os.path.join(project_root, "data", file_name)
+        self.registry = registry or get_registry(project_root)
+        self.registry.register("child_cases", lambda r: self.stream())
+
+    def load(self) -> ChildCaseAggregates:
+        return self.registry.get("child_cases")
+
+    def stream(self) -> ChildCaseAggregates:
+        from openpyxl import load_workbook
+
+        wb = load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            return self._aggregate(wb.worksheets[0].iter_rows(values_only=True))
+        finally:
+            wb.close()
+
+    def _aggregate(self, rows) -> ChildCaseAggregates:
+        agg = ChildCaseAggregates()
+        district_col = None
+        year_cols = {}          # wide layout: column -> period
+        date_col = count_col = None
+
+        for row in rows:
+            agg.rows_read += 1
+            cells = ["" if v is None else str(v).strip().lower() for v in row]
+
+            if district_col is None:
+                if "district" in cells:
+                    district_col = cells.index("district")
+                    date_col = next((i for i, c in enumerate(cells) if c.startswith(_DATE_HEADERS)), None)
+                    count_col = next((i for i, c in enumerate(cells)
+                                      if i != district_col and c.startswith(_COUNT_HEADERS)), None)
+                continue
+
+            if not year_cols and date_col is None:
+                periods = {i: _period(v) for i, v in enumerate(row)}
+                periods = {i: p for i, p in periods.items() if p is not None}
+                if len(periods) >= 2:
+                    # Year header sits on its own row below "District"
+                    year_cols = {i: p for i, (p, _) in periods.items()}
+                    agg.provisional.update(p for p, prov in periods.values() if prov)
+                    count_col = None
+                    continue
+                if len(periods) == 1 and count_col is not None:
+                    # Single year header row over a count column: treat as wide with one period
+                    year_cols = {i: p for i, (p, _) in periods.items()}
+                    continue
+
+            district = row[district_col] if district_col < len(row) else None
+            if district is None or not str(district).strip():
+                continue
+            district = str(district).strip()
+
+            if year_cols:
+                for i, period in year_cols.items():
+                    cases = _number(row[i]) if i < len(row) else None
+                    if cases is not None:
+                        agg.add(district, period, cases)
+            elif date_col is not None:
+                period = _period(row[date_col]) if date_col < len(row) else None
+                if period is None:
+                    continue
+                cases = _number(row[count_col]) if count_col is not None else 1
+                agg.add(district, period[0], 1 if cases is None else cases)
+
+        return agg
@@ -0,0 +1,122 @@
+import os
+import threading
+import time
+
+import pandas as pd
+
+from dataloader.artifacts import ArtifactSet
+from dataloader.model_loader import load_model, quantize_model
+from dataloader.schemas import DEMOGRAPHICS, POVERTY_LINES, read_source
+from db.district_store import SqliteDistrictStore
+from utils import tracing
+from utils.embedding_store import EmbeddingStore
+
+# Registry views are shallow copies of one shared frame. The serving entry points (app.py and the
+# Streamlit pages) turn on copy-on-write, the pandas 3 default, so an in-place edit by one agent
+# copies the touched column instead of changing everyone's data. It is a process-wide pandas
+# option, so it is left to them rather than set on import here.
+
+
+def _view(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    if isinstance(value, dict):
+        return {k: _view(v) for k, v in value.items()}
+    return value
+
+
+class DatasetRegistry:
+    """Process-wide cache of loaded datasets, shared by every agent of a project.
+
+    Each source is loaded once on first get() and handed out as a read-only view.
+    Loaders receive the registry, so derived datasets (e.g. the merged district table)
+    can be registered on top of the raw workbooks. version changes whenever data is invalidated.
+    With a prebuilt ArtifactSet, datasets it contains are read from the build instead; with a
+    district database (db/district_store.py) districts and insights are queried from SQLite.
+    """
+
+    def __init__(self, project_root: str, artifacts: ArtifactSet = None, district_db: str = None):
+        self.project_root = project_root
+        self.artifacts = artifacts
+        self.district_db = district_db
+        self.version = 0
+        self._loaders = {}
+        self._reloadable = set()
+        self._data = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, loader, replace: bool = False, reloadable: bool = True):
+        with self._lock:
+            if name in self._loaders and not replace:
+                return
+            if self.artifacts is not None and name in self.artifacts.datasets:
+                loader = self.artifacts.loader(name, loader)
+            self._loaders[name] = loader
+            if reloadable:
+                self._reloadable.add(name)
+            self._data.pop(name, None)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._loaders
+
+    def get(self, name: str):
+        with self._lock:
+            if name not in self._data:
+                if name not in self._loaders:
+                    raise KeyError(f"Dataset '{name}' is not registered")
+                t0 = time.perf_counter()
+                with tracing.span(f"registry.load.{name}"):
+                    self._data[name] = self._loaders[name](self)
+                tracing.set_gauge(f"{name}_load_seconds", time.perf_counter() - t0)
+            return _view(self._data[name])
+
+    def invalidate(self, *names: str):
+        """Drop cached datasets (all of them if no names given) and bump the version."""
+        with self._lock:
+            for name in names or list(self._data):
+                self._data.pop(name, None)
+            self.version += 1
+
+    def reload(self):
+        """Invalidate every data-derived dataset (models stay loaded) so the next get() re-reads the files."""
+        self.invalidate(*self._reloadable)
+
+    def path(self, *parts: str) -> str:
+        return os.path.join(self.project_root, *parts)
+
+    def embedding_store(self, model_id: str, namespace: str, texts) -> EmbeddingStore:
+        """The prebuilt embeddings if they hold exactly these texts, else the incremental store in model/embeddings."""
+        if self.district_db is not None:
+            return self.get("district_repository").embedding_store(model_id, namespace)
+        if self.artifacts is not None and self.artifacts.fresh():
+            store = EmbeddingStore(self.artifacts.path("embeddings"), model_id, namespace)
+            if store.holds(texts):
+                return store
+        return EmbeddingStore(self.path("model", "embeddings"), model_id, namespace)
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(project_root: str) -> DatasetRegistry:
+    project_root = os.path.abspath(project_root)
+    with _registries_lock:
+        if project_root not in _registries:
+            # Optional SQLite backend (script/build_district_db.py): DSGP_DISTRICT_DB=db/districts.sqlite3
+            district_db = os.environ.get("DSGP_DISTRICT_DB")
+            if district_db:
+                district_db = os.path.join(project_root, district_db)
+            registry = DatasetRegistry(
+                project_root, artifacts=ArtifactSet.current(project_root), district_db=district_db or None
+            )
+            registry.register("model", lambda r: load_model(r.project_root), reloadable=False)
+            registry.register("query_model_int8", lambda r: quantize_model(r.get("model")), reloadable=False)
+            for name, schema in (("poverty_lines", POVERTY_LINES), ("demographics", DEMOGRAPHICS)):
+                registry.register(name, lambda r, s=schema: read_source(r.path("data", s.file_name), s))
+            if registry.district_db is not None:
+                # Registered first, so the workbook-backed loaders of the same names never replace them
+                registry.register("district_repository", lambda r: SqliteDistrictStore(r.district_db))
+                registry.register("poverty_merged", lambda r: r.get("district_repository").merged())
+            _registries[project_root] = registry
+        return _registries[project_root]
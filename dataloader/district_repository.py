@@ -0,0 +1,212 @@
+import re
+from abc import ABC, abstractmethod
+from functools import cached_property
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from entity.district import District, RankedDistrict
+
+# Demographic fields aggregated per district and carried in insight payloads
+DEMO_FIELDS = ["TOT_POP", "MALE", "FEMALE", "POP_DENSITY", "AREA"]
+STAT_COLUMNS = ["first", "latest", "change", "growth_rate", "periods", "rank", "percentile"]
+
+
+def poverty_stats(poverty_df: pd.DataFrame) -> pd.DataFrame:
+    """First/latest value, change, growth rate and rank of every district in one vectorized pass."""
+    values = poverty_df.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+    valid = ~np.isnan(values)
+    has = valid.any(axis=1)
+    rows = np.arange(len(values))
+    first_idx = valid.argmax(axis=1)
+    last_idx = values.shape[1] - 1 - valid[:, ::-1].argmax(axis=1)
+    first = np.where(has, values[rows, first_idx], np.nan)
+    latest = np.where(has, values[rows, last_idx], np.nan)
+
+    stats = pd.DataFrame({
+        "first": first,
+        "latest": latest,
+        "change": latest - first,
+        "growth_rate": (latest - first) / np.where(first != 0, first, np.nan),
+        "periods": valid.sum(axis=1),
+    }, index=poverty_df.index)
+    # rank 1 = highest latest poverty line; percentile = share of districts at or below this one
+    stats["rank"] = stats["latest"].rank(ascending=False, method="min")
+    stats["percentile"] = stats["latest"].rank(pct=True, method="max")
+    return stats
+
+
+def aggregate_demographics(demo_df: pd.DataFrame) -> pd.DataFrame:
+    """One row of DEMO_FIELDS per district (the workbook has several rows per district)."""
+    picked = [c for c in DEMO_FIELDS if c in demo_df.columns and c != "POP_DENSITY"]
+    if "DISTRICT_N" not in demo_df.columns or not picked:
+        return pd.DataFrame()
+
+    grouped = demo_df.groupby("DISTRICT_N", sort=False, observed=True)
+    agg = grouped[picked].sum(numeric_only=True)
+    if "POP_DENSITY" in demo_df.columns:
+        if "TOT_POP" in agg.columns and "AREA" in agg.columns:
+            agg["POP_DENSITY"] = agg["TOT_POP"] / agg["AREA"].where(agg["AREA"] != 0)
+        else:
+            agg["POP_DENSITY"] = grouped["POP_DENSITY"].mean()
+    agg.index = agg.index.astype(str)
+    return agg
+
+
+def period_range(periods: List[str], start: Optional[str] = None, end: Optional[str] = None) -> List[str]:
+    """Periods between start and end (inclusive, in workbook order); unknown labels raise KeyError."""
+    for label in (start, end):
+        if label is not None and label not in periods:
+            raise KeyError(f"Unknown period '{label}'")
+    lo = periods.index(start) if start is not None else 0
+    hi = periods.index(end) + 1 if end is not None else len(periods)
+    return periods[lo:hi]
+
+
+_MONTHS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+_PERIOD = re.compile(r"^\s*(\d{4})(?:\s+([A-Za-z]+))?\s*$")
+
+
+def period_axis(periods: List[str]):
+    """Chart x values for period labels and their chronological order.
+
+    Returns (axis, x, order): "Month" with "YYYY-MM" values for labels like "2024 jan", "Year"
+    with int years for "2019", else "Period" with the labels themselves in workbook order.
+    x is aligned with periods; order lists their positions sorted by time.
+    """
+    parsed = [_PERIOD.match(str(p)) for p in periods]
+    if periods and all(parsed):
+        months = [m.group(2) and m.group(2)[:3].lower() for m in parsed]
+        if all(m in _MONTHS for m in months):
+            x = [f"{m.group(1)}-{_MONTHS.index(mon) + 1:02d}" for m, mon in zip(parsed, months)]
+            return "Month", x, sorted(range(len(x)), key=x.__getitem__)
+        if not any(months):
+            x = [int(m.group(1)) for m in parsed]
+            return "Year", x, sorted(range(len(x)), key=x.__getitem__)
+    return "Period", [str(p) for p in periods], list(range(len(periods)))
+
+
+class DistrictRepository(ABC):
+    """Read access to districts, per-period poverty lines and demographic aggregates.
+
+    Filters (districts, period range, top-N) are arguments so a backend can apply them where the
+    data lives: FrameDistrictRepository in pandas, db.district_store.SqliteDistrictStore in SQL.
+    in_memory tells callers whether precomputing everything up front is cheap.
+    """
+
+    in_memory = True
+
+    @abstractmethod
+    def districts(self) -> List[str]:
+        pass
+
+    @abstractmethod
+    def district(self, name: str) -> Optional[District]:
+        pass
+
+    @abstractmethod
+    def periods(self) -> List[str]:
+        pass
+
+    @abstractmethod
+    def merged(self) -> pd.DataFrame:
+        """District, Population, average_poverty_line and text of every district in both workbooks."""
+
+    @abstractmethod
+    def poverty_lines(self, districts: Iterable[str] = None, start: str = None, end: str = None) -> pd.DataFrame:
+        """Wide table: one row per district, one column per period."""
+
+    @abstractmethod
+    def poverty_stats(self, districts: Iterable[str] = None) -> pd.DataFrame:
+        pass
+
+    @abstractmethod
+    def districts_ranked(self) -> int:
+        pass
+
+    @abstractmethod
+    def demographics(self, districts: Iterable[str] = None) -> pd.DataFrame:
+        pass
+
+    @abstractmethod
+    def top(self, metric: str, n: int = 10, ascending: bool = False) -> List[RankedDistrict]:
+        pass
+
+    def metrics(self) -> List[str]:
+        return STAT_COLUMNS + DEMO_FIELDS
+
+
+def _rows(df: pd.DataFrame, districts) -> pd.DataFrame:
+    if districts is None:
+        return df
+    return df[df.index.isin(list(districts))]
+
+
+class FrameDistrictRepository(DistrictRepository):
+    """The workbooks as pandas frames from the registry; statistics are computed once per data version."""
+
+    def __init__(self, registry):
+        from dataloader.insight.poverty_insights import PovertyInsightsDataLoader
+
+        self.registry = registry
+        PovertyInsightsDataLoader(registry.project_root, registry=registry)
+
+    @cached_property
+    def poverty_df(self) -> pd.DataFrame:
+        return self.registry.get("poverty_insight_frames")["poverty_df"]
+
+    @cached_property
+    def demo_df(self) -> pd.DataFrame:
+        return aggregate_demographics(self.registry.get("poverty_insight_frames")["demo_df"])
+
+    @cached_property
+    def stats_df(self) -> pd.DataFrame:
+        return poverty_stats(self.poverty_df)
+
+    def districts(self) -> List[str]:
+        return list(self.poverty_df.index) + [d for d in self.demo_df.index if d not in self.poverty_df.index]
+
+    def district(self, name: str) -> Optional[District]:
+        merged = self.merged()
+        row = merged[merged["District"] == name]
+        if not row.empty:
+            r = row.iloc[0]
+            return District(name, int(r["Population"]), float(r["average_poverty_line"]), r["text"])
+        if name in self.poverty_df.index or name in self.demo_df.index:
+            return District(name, has_poverty=name in self.poverty_df.index)
+        return None
+
+    def periods(self) -> List[str]:
+        return [str(c) for c in self.poverty_df.columns]
+
+    def merged(self) -> pd.DataFrame:
+        from dataloader.poverty_data_loader import PovertyDataLoader
+
+        PovertyDataLoader(self.registry.project_root, registry=self.registry)
+        return self.registry.get("poverty_merged")
+
+    def poverty_lines(self, districts=None, start=None, end=None) -> pd.DataFrame:
+        df = _rows(self.poverty_df, districts)
+        if start is None and end is None:
+            return df
+        return df[period_range(self.periods(), start, end)]
+
+    def poverty_stats(self, districts=None) -> pd.DataFrame:
+        return _rows(self.stats_df, districts)
+
+    def districts_ranked(self) -> int:
+        return int(self.stats_df["latest"].notna().sum())
+
+    def demographics(self, districts=None) -> pd.DataFrame:
+        return _rows(self.demo_df, districts)
+
+    def top(self, metric: str, n: int = 10, ascending: bool = False) -> List[RankedDistrict]:
+        if metric in STAT_COLUMNS:
+            values = self.stats_df[metric]
+        elif metric in self.demo_df.columns:
+            values = self.demo_df[metric]
+        else:
+            raise KeyError(f"Unknown metric '{metric}'")
+        values = values.dropna().sort_values(ascending=ascending, kind="stable").head(n)
+        return [RankedDistrict(d, metric, float(v), i + 1) for i, (d, v) in enumerate(values.items())]
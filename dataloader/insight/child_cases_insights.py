@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from dataloader.child_case_data_loader import ChildCaseDataLoader
+
+
+def build_child_case_frames(agg) -> dict:
+    counts = agg.to_frame()
+    values = counts.to_numpy()
+    # Provisional periods (marked "2024*" in the source) are kept but flagged
+    final = np.array([p not in agg.provisional for p in counts.columns], dtype=bool)
+    # Unreported cells are NaN: they count towards neither totals nor averages
+    reported = ~np.isnan(values)
+    with np.errstate(invalid="ignore"):
+        summary = pd.DataFrame({
+            "total_cases": np.where(reported.any(axis=1), np.nansum(values, axis=1), np.nan),
+            "latest_period": counts.columns[-1] if len(counts.columns) else None,
+            "latest_cases": values[:, -1] if len(counts.columns) else np.nan,
+            "average_cases": (np.nansum(values[:, final], axis=1) / reported[:, final].sum(axis=1)
+                              if final.any() else np.nan),
+        }, index=counts.index)
+    return {"cases_df": counts, "summary_df": summary, "provisional": sorted(agg.provisional)}
+
+
+class ChildCasesInsightsDataLoader:
+    def __init__(self, project_root: str, registry=None):
+        self.loader = ChildCaseDataLoader(project_root, registry=registry)
+        self.registry = self.loader.registry
+        self.registry.register("child_case_frames", lambda r: build_child_case_frames(self.loader.load()))
+
+    def load(self):
+        return self.registry.get("child_case_frames")
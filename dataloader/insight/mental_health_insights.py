@@ -0,0 +1,8 @@
+from typing import Any, Dict
+
+import pandas as pd
+
+
+def build_mental_health_insights(df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    indicators = df.set_index("District").to_dict(orient="index")
+    return {district: {"available": True, "indicators": row} for district, row in indicators.items()}
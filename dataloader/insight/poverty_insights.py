@@ -1,25 +1,35 @@
-import os
-import pandas as pd
+from dataloader.dataset_registry import get_registry
+from dataloader.district_repository import DistrictRepository, FrameDistrictRepository
+
+
+def build_insight_frames(registry):
+    poverty_df = registry.get("poverty_lines")
+    poverty_df.columns = poverty_df.columns.str.strip()
+    if "District" in poverty_df.columns:
+        poverty_df = poverty_df.set_index("District")
+
+    # District names arrive stripped and categorical (dataloader/schemas.py)
+    demo_df = registry.get("demographics")
+    demo_df.columns = demo_df.columns.str.strip()
+
+    return {"poverty_df": poverty_df, "demo_df": demo_df}
 
 
 class PovertyInsightsDataLoader:
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, registry=None):
         self.project_root = project_root
-
-        self.poverty_line_path = os.path.join(project_root, "data", "Povertylines.xlsx")
-        self.demographic_path = os.path.join(project_root, "data", "demographic_district_wise.xlsx")
+        self.registry = registry or get_registry(project_root)
+        self.registry.register("poverty_insight_frames", build_insight_frames)
+        # Statistics and payloads of InsightGeneratorAgent; only a prebuilt artifact
+        # (script/build_artifacts.py) provides them, None means "compute them here"
+        self.registry.register("poverty_insight_index", lambda r: None)
+        self.registry.register("district_repository", FrameDistrictRepository)
 
     def load(self):
-        poverty_df = pd.read_excel(self.poverty_line_path)
-        poverty_df.columns = poverty_df.columns.str.strip()
-        if "District" in poverty_df.columns:
-            poverty_df = poverty_df.set_index("District")
-
-        demo_df = pd.read_excel(self.demographic_path)
-        demo_df.columns = demo_df.columns.str.strip()
+        return self.registry.get("poverty_insight_frames")
 
-        # If you have DISTRICT_N, keep it normalized
-        if "DISTRICT_N" in demo_df.columns:
-            demo_df["DISTRICT_N"] = demo_df["DISTRICT_N"].astype(str).str.strip()
+    def repository(self) -> DistrictRepository:
+        return self.registry.get("district_repository")
 
-        return {"poverty_df": poverty_df, "demo_df": demo_df}
+    def prebuilt(self):
+        return self.registry.get("poverty_insight_index")
@@ -0,0 +1,35 @@
+import os
+
+import pandas as pd
+
+from dataloader.dataset_registry import get_registry
+from utils.excel_snapshot import read_excel_cached
+
+DISTRICT_COLUMNS = ("District", "DISTRICT", "DISTRICT_N", "district")
+
+
+def build_mental_health_df(path) -> pd.DataFrame:
+    df = read_excel_cached(path)
+    df.columns = df.columns.astype(str).str.strip()
+    district_col = next((c for c in DISTRICT_COLUMNS if c in df.columns), None)
+    if district_col is None:
+        raise ValueError(f"{path} has no district column (expected one of {DISTRICT_COLUMNS})")
+
+    df = df.rename(columns={district_col: "District"})
+    df["District"] = df["District"].astype(str).str.strip()
+    # One row per district: facility-level sheets are summed up
+    return df.groupby("District", sort=True).sum(numeric_only=True).reset_index()
+
+
+class MentalHealthDataLoader:
+    def __init__(self, project_root, registry=None, file_name="mental_health.xlsx"):
+        self.project_root = project_root
+        self.path = os.path.join(project_root, "data", file_name)
+        self.registry = registry or get_registry(project_root)
+        self.registry.register("mental_health", lambda r: build_mental_health_df(self.path))
+
+    def available(self) -> bool:
+        return os.path.exists(self.path)
+
+    def load(self) -> pd.DataFrame:
+        return self.registry.get("mental_health")
@@ -0,0 +1,75 @@
+import copy
+import json
+import os
+import pickle
+
+ARTIFACT_DIR = os.path.join("model", "poverty_model")
+PICKLE_PATH = os.path.join("model", "poverty_model.pkl")
+
+
+def export_model(model, out_dir: str):
+    """Write a SentenceTransformer as a plain directory: configs plus safetensors weights."""
+    os.makedirs(out_dir, exist_ok=True)
+    model.save(out_dir, safe_serialization=True)
+
+
+def _transformer_weights(artifact_dir: str):
+    """(module index, safetensors path) of the transformer module, or None if the artifact has none."""
+    with open(os.path.join(artifact_dir, "modules.json")) as f:
+        modules = json.load(f)
+    for idx, entry in enumerate(modules):
+        if entry["type"].endswith("Transformer"):
+            path = os.path.join(artifact_dir, entry["path"], "model.safetensors")
+            return (idx, path) if os.path.exists(path) else None
+    return None
+
+
+def _check_mapped(module, state_dict):
+    # A silent key mismatch would leave those parameters randomly initialised (or on the heap)
+    expected = set(module.state_dict())
+    missing = sorted(expected - set(state_dict))
+    unexpected = sorted(set(state_dict) - expected)
+    if missing or unexpected:
+        raise ValueError(f"Weights do not match the encoder: missing {missing[:5]}, unexpected {unexpected[:5]}")
+
+
+def load_model(project_root: str, device: str = "cpu"):
+    """Load the encoder from the exported artifact, or from the legacy pickle if there is none.
+
+    On CPU the weights are read once: safetensors hands back tensors that view the mmapped file, and
+    transformers builds the modules on the meta device (low_cpu_mem_usage) and takes those tensors as
+    the parameters. Every worker then serves the weights from the same page cache.
+    """
+    artifact_dir = os.path.join(project_root, ARTIFACT_DIR)
+    if os.path.exists(os.path.join(artifact_dir, "modules.json")):
+        from sentence_transformers import SentenceTransformer
+
+        weights = _transformer_weights(artifact_dir) if device == "cpu" else None
+        if weights is None:
+            return SentenceTransformer(artifact_dir, device=device, local_files_only=True).eval()
+
+        from safetensors.torch import load_file
+
+        idx, path = weights
+        state_dict = load_file(path)
+        model = SentenceTransformer(
+            artifact_dir, device=device, local_files_only=True,
+            model_kwargs={"state_dict": state_dict, "low_cpu_mem_usage": True},
+        )
+        _check_mapped(model[idx].auto_model, state_dict)
+        return model.eval()
+
+    with open(os.path.join(project_root, PICKLE_PATH), "rb") as f:
+        return pickle.load(f)
+
+
+def quantize_model(model):
+    """Copy of the encoder with its Linear layers dynamically quantized to int8 (CPU only)."""
+    import torch
+
+    engines = torch.backends.quantized.supported_engines
+    if "fbgemm" not in engines and "qnnpack" in engines:
+        # ARM hosts (e.g. Apple silicon) only ship the qnnpack kernels
+        torch.backends.quantized.engine = "qnnpack"
+    model = copy.deepcopy(model).to("cpu")
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True).eval()
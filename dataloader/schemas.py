@@ -0,0 +1,81 @@
+import re
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.excel_snapshot import read_excel_cached
+
+
+@dataclass(frozen=True)
+class SourceSchema:
+    """The columns a workbook is read with and the dtypes they are stored as.
+
+    Undeclared columns are never loaded, so they cannot reach frames or insight payloads.
+    The schema is passed to read_excel as the usecols filter; its repr keys the Parquet snapshot.
+    """
+
+    file_name: str
+    key: Tuple[str, ...] = ()            # labels kept as strings (one row per value)
+    categorical: Tuple[str, ...] = ()    # labels repeated across rows (districts of a GN-level table)
+    integer: Tuple[str, ...] = ()        # counts, downcast to the smallest integer type that fits
+    numeric: Tuple[str, ...] = ()        # measures kept as float64
+    wide_integer: Optional[str] = None   # regex for period columns of a wide table, stored like `integer`
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return self.key + self.categorical + self.integer + self.numeric
+
+    def is_wide(self, column) -> bool:
+        return self.wide_integer is not None and re.match(self.wide_integer, str(column).strip()) is not None
+
+    def __call__(self, column) -> bool:
+        return str(column).strip() in self.columns or self.is_wide(column)
+
+
+POVERTY_LINES = SourceSchema("Povertylines.xlsx", key=("District",), wide_integer=r"\d{4}\b")
+DEMOGRAPHICS = SourceSchema(
+    "demographic_district_wise.xlsx",
+    categorical=("DISTRICT_N",),
+    integer=("PPROJ_22", "TOT_POP", "MALE", "FEMALE"),
+    numeric=("AREA", "POP_DENSITY"),
+)
+
+
+def _downcast_integer(s: pd.Series) -> pd.Series:
+    s = pd.to_numeric(s, errors="coerce")
+    if s.isna().any() or not np.array_equal(s, np.floor(s)):
+        # Blanks or fractions: an integer dtype would lose them
+        return s
+    return pd.to_numeric(s.astype(np.int64), downcast="integer")
+
+
+def apply_schema(df: pd.DataFrame, schema: SourceSchema) -> pd.DataFrame:
+    # Columns the workbook lacks are simply absent; consumers check column presence
+    df = df[[c for c in df.columns if schema(c)]]
+    out = {}
+    for c in df.columns:
+        name = str(c).strip()
+        if name in schema.key:
+            out[c] = df[c].astype(str).str.strip()
+        elif name in schema.categorical:
+            out[c] = df[c].astype(str).str.strip().astype("category")
+        elif name in schema.integer or schema.is_wide(c):
+            out[c] = _downcast_integer(df[c])
+        elif name in schema.numeric:
+            out[c] = pd.to_numeric(df[c], errors="coerce").astype(np.float64)
+    return pd.DataFrame(out, index=df.index)
+
+
+def read_source(path: str, schema: SourceSchema) -> pd.DataFrame:
+    return apply_schema(read_excel_cached(path, usecols=schema), schema)
+
+
+def frame_bytes(value) -> int:
+    """Resident size of a frame (or a dict of frames), counting the Python strings in object columns."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if isinstance(value, dict):
+        return sum(frame_bytes(v) for v in value.values())
+    return 0
@@ -0,0 +1,285 @@
+import json
+import os
+import sqlite3
+import threading
+from functools import cached_property
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from dataloader.district_repository import DEMO_FIELDS, STAT_COLUMNS, DistrictRepository, period_range
+from entity.district import District, PovertyLine, RankedDistrict
+from utils.embedding_store import text_key
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "districts.sqlite3")
+# SQLite's default limit on host parameters per statement is 999 on older builds
+_CHUNK = 900
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS districts ("
+    " id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, population INTEGER, average_poverty_line REAL,"
+    " text TEXT, has_poverty INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS periods (ord INTEGER PRIMARY KEY, label TEXT NOT NULL UNIQUE)",
+    # NUMERIC keeps whole-rupee values as integers, like the workbook
+    "CREATE TABLE IF NOT EXISTS poverty_lines ("
+    " district_id INTEGER NOT NULL, period_ord INTEGER NOT NULL, value NUMERIC NOT NULL,"
+    " PRIMARY KEY (district_id, period_ord)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS poverty_lines_by_period ON poverty_lines (period_ord, value)",
+    "CREATE TABLE IF NOT EXISTS poverty_stats (district_id INTEGER PRIMARY KEY, "
+    + ", ".join(f'"{c}" ' + ("INTEGER" if c == "periods" else "REAL") for c in STAT_COLUMNS) + ")",
+    "CREATE TABLE IF NOT EXISTS demographics (district_id INTEGER PRIMARY KEY, "
+    + ", ".join(f'"{c}" NUMERIC' for c in DEMO_FIELDS) + ")",
+    "CREATE TABLE IF NOT EXISTS embeddings ("
+    " model_id TEXT NOT NULL, namespace TEXT NOT NULL, key TEXT NOT NULL, vector BLOB NOT NULL,"
+    " PRIMARY KEY (model_id, namespace, key)) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+] + [
+    # top-N by any metric is an index scan
+    f'CREATE INDEX IF NOT EXISTS poverty_stats_{c} ON poverty_stats ("{c}")' for c in STAT_COLUMNS
+] + [
+    f'CREATE INDEX IF NOT EXISTS demographics_{c} ON demographics ("{c}")' for c in DEMO_FIELDS
+]
+
+
+def _chunks(values: List[str]):
+    for i in range(0, len(values), _CHUNK):
+        yield values[i:i + _CHUNK]
+
+
+class SqliteEmbeddingStore:
+    """EmbeddingStore interface over the embeddings table of a district database."""
+
+    def __init__(self, db: "SqliteDistrictStore", model_id: str, namespace: str):
+        self.db = db
+        self.model_id = model_id
+        self.namespace = namespace
+
+    def _stored(self, keys) -> dict:
+        out = {}
+        for chunk in _chunks(list(set(keys))):
+            rows = self.db._conn().execute(
+                f"SELECT key, vector FROM embeddings WHERE model_id = ? AND namespace = ?"
+                f" AND key IN ({','.join('?' * len(chunk))})",
+                (self.model_id, self.namespace, *chunk),
+            )
+            out.update((k, np.frombuffer(v, dtype=np.float32)) for k, v in rows)
+        return out
+
+    def holds(self, texts) -> bool:
+        keys = [text_key(t) for t in texts]
+        return len(self._stored(keys)) == len(set(keys))
+
+    def get_or_encode(self, texts, encode_fn) -> np.ndarray:
+        keys = [text_key(t) for t in texts]
+        if not keys:
+            return np.empty((0, 0), dtype=np.float32)
+        stored = self._stored(keys)
+        missing = [i for i, k in enumerate(keys) if k not in stored]
+        if missing:
+            fresh = np.asarray(encode_fn([texts[i] for i in missing]), dtype=np.float32)
+            with self.db._conn() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)",
+                    [(self.model_id, self.namespace, keys[i], v.tobytes()) for i, v in zip(missing, fresh)],
+                )
+            stored.update((keys[i], v) for i, v in zip(missing, fresh))
+        return np.stack([stored[k] for k in keys])
+
+
+class SqliteDistrictStore(DistrictRepository):
+    """Districts, per-period poverty lines, statistics, demographic aggregates and embeddings in one
+    indexed SQLite file (written by script/build_district_db.py).
+
+    Every read takes its filters as SQL predicates, so a worker only ever holds the rows a request
+    needs and memory does not grow with the length of the poverty-line history.
+    """
+
+    in_memory = False
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._conn() as conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite connections can't be shared across threads; keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _fetch(self, sql: str, districts, params=()) -> list:
+        """Rows of sql with its {where} placeholder bound to a filter on d.name (None = every district).
+
+        The district parameters follow params, so {where} must come after every other placeholder.
+        """
+        conn = self._conn()
+        if districts is None:
+            return conn.execute(sql.format(where="1"), params).fetchall()
+        rows = []
+        for chunk in _chunks(list(districts)):
+            where = f"d.name IN ({','.join('?' * len(chunk))})"
+            rows += conn.execute(sql.format(where=where), (*params, *chunk)).fetchall()
+        return rows
+
+    def _frame(self, sql: str, columns: List[str], districts=None, params=()) -> pd.DataFrame:
+        # Plain cursor + from_records: per-request lookups are a few rows, where read_sql's overhead dominates
+        return pd.DataFrame.from_records(self._fetch(sql, districts, params), columns=columns)
+
+    def meta(self, key: str) -> Optional[str]:
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def districts(self) -> List[str]:
+        return [name for (name,) in self._conn().execute("SELECT name FROM districts ORDER BY id")]
+
+    def district(self, name: str) -> Optional[District]:
+        row = self._conn().execute(
+            "SELECT name, population, average_poverty_line, text, has_poverty FROM districts WHERE name = ?", (name,)
+        ).fetchone()
+        return None if row is None else District(row[0], row[1], row[2], row[3], bool(row[4]))
+
+    @cached_property
+    def _periods(self) -> List[str]:
+        # The store is a snapshot: values that only change on ingest are read once per instance
+        return [label for (label,) in self._conn().execute("SELECT label FROM periods ORDER BY ord")]
+
+    def periods(self) -> List[str]:
+        return list(self._periods)
+
+    def merged(self) -> pd.DataFrame:
+        return self._frame(
+            "SELECT name, population, average_poverty_line, text FROM districts d"
+            " WHERE {where} AND text IS NOT NULL ORDER BY id",
+            ["District", "Population", "average_poverty_line", "text"],
+        )
+
+    def poverty_lines(self, districts=None, start=None, end=None) -> pd.DataFrame:
+        periods = self._periods
+        labels = period_range(periods, start, end)
+        lo = periods.index(labels[0]) if labels else 0
+        hi = periods.index(labels[-1]) if labels else -1
+        # LEFT JOIN: a district without any value in the range still gets its (empty) row
+        rows = self._fetch(
+            "SELECT d.name, v.period_ord, v.value FROM districts d"
+            " LEFT JOIN poverty_lines v ON v.district_id = d.id AND v.period_ord BETWEEN ? AND ?"
+            " WHERE {where} AND d.has_poverty = 1 ORDER BY d.id, v.period_ord",
+            districts, (lo, hi),
+        )
+        wide = {}
+        for name, ord_, value in rows:
+            row = wide.setdefault(name, {})
+            if ord_ is not None:
+                row[periods[ord_]] = value
+        df = pd.DataFrame.from_dict(wide, orient="index", columns=labels) if wide else pd.DataFrame(columns=labels)
+        df.index.name = "District"
+        return df
+
+    def poverty_stats(self, districts=None) -> pd.DataFrame:
+        columns = ", ".join(f's."{c}"' for c in STAT_COLUMNS)
+        return self._frame(
+            f"SELECT d.name, {columns} FROM poverty_stats s JOIN districts d ON d.id = s.district_id"
+            " WHERE {where} ORDER BY d.id",
+            ["District"] + STAT_COLUMNS, districts,
+        ).set_index("District")
+
+    @cached_property
+    def _districts_ranked(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM poverty_stats WHERE latest IS NOT NULL").fetchone()[0]
+
+    def districts_ranked(self) -> int:
+        return self._districts_ranked
+
+    @cached_property
+    def _demo_fields(self) -> List[str]:
+        # Only the fields the source workbook actually had
+        return json.loads(self.meta("demographic_fields") or "[]")
+
+    def demographics(self, districts=None) -> pd.DataFrame:
+        fields = self._demo_fields
+        if not fields:
+            return pd.DataFrame()
+        columns = ", ".join(f'g."{c}"' for c in fields)
+        return self._frame(
+            f"SELECT d.name, {columns} FROM demographics g JOIN districts d ON d.id = g.district_id"
+            " WHERE {where} ORDER BY d.id",
+            ["District"] + fields, districts,
+        ).set_index("District")
+
+    def top(self, metric: str, n: int = 10, ascending: bool = False) -> List[RankedDistrict]:
+        if metric in STAT_COLUMNS:
+            table = "poverty_stats"
+        elif metric in self._demo_fields:
+            table = "demographics"
+        else:
+            raise KeyError(f"Unknown metric '{metric}'")
+        rows = self._conn().execute(
+            f'SELECT d.name, t."{metric}" FROM {table} t JOIN districts d ON d.id = t.district_id'
+            f' WHERE t."{metric}" IS NOT NULL ORDER BY t."{metric}" {"ASC" if ascending else "DESC"}, d.id LIMIT ?',
+            (n,),
+        ).fetchall()
+        return [RankedDistrict(name, metric, float(value), i + 1) for i, (name, value) in enumerate(rows)]
+
+    def embedding_store(self, model_id: str, namespace: str) -> SqliteEmbeddingStore:
+        return SqliteEmbeddingStore(self, model_id, namespace)
+
+    def ingest(self, source: DistrictRepository, meta: dict = None):
+        """Replace every table with the contents of another repository (e.g. the workbook frames)."""
+        merged = source.merged().set_index("District")
+        poverty = source.poverty_lines()
+        stats = source.poverty_stats()
+        demo = source.demographics()
+        districts = [
+            District(
+                name,
+                int(merged.at[name, "Population"]) if name in merged.index else None,
+                float(merged.at[name, "average_poverty_line"]) if name in merged.index else None,
+                merged.at[name, "text"] if name in merged.index else None,
+                name in poverty.index,
+            )
+            for name in source.districts()
+        ]
+        ids = {d.name: i for i, d in enumerate(districts)}
+        periods = [str(c) for c in poverty.columns]
+        order = {p: i for i, p in enumerate(periods)}
+        lines = [
+            PovertyLine(name, period, value)
+            for name, row in zip(poverty.index, poverty.to_dict(orient="records"))
+            for period, value in row.items() if pd.notna(value)
+        ]
+
+        def _value(v):
+            return None if pd.isna(v) else v.item() if isinstance(v, np.generic) else v
+
+        with self._conn() as conn:
+            for table in ("districts", "periods", "poverty_lines", "poverty_stats", "demographics"):
+                conn.execute(f"DELETE FROM {table}")
+            conn.executemany(
+                "INSERT INTO districts VALUES (?, ?, ?, ?, ?, ?)",
+                [(ids[d.name], d.name, d.population, d.average_poverty_line, d.text, int(d.has_poverty))
+                 for d in districts],
+            )
+            conn.executemany("INSERT INTO periods VALUES (?, ?)", list(enumerate(periods)))
+            conn.executemany(
+                "INSERT INTO poverty_lines VALUES (?, ?, ?)",
+                [(ids[l.district], order[str(l.period)], _value(l.value)) for l in lines],
+            )
+            conn.executemany(
+                f"INSERT INTO poverty_stats VALUES ({','.join('?' * (len(STAT_COLUMNS) + 1))})",
+                [(ids[name], *map(_value, row)) for name, row in zip(stats.index, stats[STAT_COLUMNS].to_numpy())],
+            )
+            fields = [c for c in DEMO_FIELDS if c in demo.columns]
+            columns = "".join(f', "{c}"' for c in fields)
+            conn.executemany(
+                f"INSERT INTO demographics (district_id{columns}) VALUES ({','.join('?' * (len(fields) + 1))})",
+                [(ids[name], *map(_value, row)) for name, row in zip(demo.index, demo[fields].itertuples(index=False))],
+            )
+            for key, value in {**(meta or {}), "demographic_fields": json.dumps(fields)}.items():
+                conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, str(value)))
+        for attr in ("_periods", "_districts_ranked", "_demo_fields"):
+            self.__dict__.pop(attr, None)
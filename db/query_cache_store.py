@@ -0,0 +1,78 @@
+import json
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+from utils.payloads import thaw
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "query_cache.sqlite3")
+
+
+class SqliteQueryCacheStore:
+    """Second cache tier on disk, so hot query embeddings and results survive restarts."""
+
+    def __init__(self, path: str = DEFAULT_PATH, max_results: int = 10_000, prune_every: int = 100):
+        self.path = path
+        # Results of every data version live side by side (workers mid-reload may be on different
+        # ones); the table is bounded by size instead, dropping the least recently written rows
+        self.max_results = max_results
+        self.prune_every = prune_every
+        self._puts = 0
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                " model_id TEXT NOT NULL, query TEXT NOT NULL, vector BLOB NOT NULL,"
+                " PRIMARY KEY (model_id, query))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS query_results ("
+                " query TEXT NOT NULL, k INTEGER NOT NULL, data_version TEXT NOT NULL, payload TEXT NOT NULL,"
+                " PRIMARY KEY (query, k, data_version))"
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite connections can't be shared across threads; keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get_embedding(self, model_id: str, query: str):
+        row = self._conn().execute(
+            "SELECT vector FROM query_embeddings WHERE model_id = ? AND query = ?", (model_id, query)
+        ).fetchone()
+        return None if row is None else np.frombuffer(row[0], dtype=np.float32)
+
+    def put_embedding(self, model_id: str, query: str, vector: np.ndarray):
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO query_embeddings VALUES (?, ?, ?)",
+                (model_id, query, np.asarray(vector, dtype=np.float32).tobytes()),
+            )
+
+    def get_result(self, query: str, k: int, data_version: str):
+        row = self._conn().execute(
+            "SELECT payload FROM query_results WHERE query = ? AND k = ? AND data_version = ?",
+            (query, k, data_version),
+        ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put_result(self, query: str, k: int, data_version: str, payload):
+        with self._conn() as conn:
+            # REPLACE re-inserts the row, so rowid order is write order
+            conn.execute(
+                "INSERT OR REPLACE INTO query_results VALUES (?, ?, ?, ?)",
+                (query, k, data_version, json.dumps(thaw(payload))),
+            )
+            self._puts += 1
+            if self._puts % self.prune_every == 0:
+                conn.execute(
+                    "DELETE FROM query_results WHERE rowid <="
+                    " (SELECT rowid FROM query_results ORDER BY rowid DESC LIMIT 1 OFFSET ?)",
+                    (self.max_results,),
+                )
@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class District:
+    name: str
+    population: Optional[int] = None
+    average_poverty_line: Optional[float] = None
+    # Text embedded for recommendations; None for districts missing from either workbook
+    text: Optional[str] = None
+    has_poverty: bool = True
+
+
+@dataclass(frozen=True)
+class PovertyLine:
+    district: str
+    period: str
+    value: float
+
+
+@dataclass(frozen=True)
+class RankedDistrict:
+    district: str
+    metric: str
+    value: float
+    position: int
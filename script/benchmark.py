@@ -0,0 +1,251 @@
+"""Offline end-to-end benchmark on synthetic poverty/demographic workbooks.
+
+Every size runs in a fresh interpreter against a generated project directory, with a small
+hashing encoder standing in for the sentence-transformer, so no model download is needed:
+
+    python script/benchmark.py                              # 25, 1k, 10k and 100k regions
+    python script/benchmark.py --sizes 25 1000 --queries 100
+    DSGP_ENCODER_WORKERS=4 python script/benchmark.py --sessions 32   # encoder pool under load
+
+Results are written to bench_results/<timestamp>-<commit>.json (or --out) for comparison between commits.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+MONTHS = ["jan", "feb", "mar", "apr", "may", "june", "july", "aug", "sep", "oct", "nov", "dec"]
+QUERIES = [
+    "low poverty", "high population", "low poverty high population", "rural areas with high poverty",
+    "urban areas", "densely populated districts", "coastal districts", "hill country tea estates",
+    "population over 50000", "poverty below 16000 near the coast",
+]
+
+
+class HashingEncoder:
+    """Stand-in for the sentence-transformer: hashed bag of words projected to a dense vector.
+
+    It exposes the subset of the SentenceTransformer.encode signature the agents use and costs
+    O(tokens) per text, so the benchmark measures the pipeline around the model, not the model.
+    """
+
+    def __init__(self, dim: int = 384, buckets: int = 4096, seed: int = 0):
+        self.dim = dim
+        self.buckets = buckets
+        self.projection = np.random.default_rng(seed).standard_normal((buckets, dim)).astype(np.float32)
+
+    def __repr__(self):
+        return f"HashingEncoder(dim={self.dim}, buckets={self.buckets})"
+
+    def encode(self, texts, convert_to_numpy=True, normalize_embeddings=False, **kwargs):
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            ids = [int(hashlib.md5(tok.encode()).hexdigest()[:8], 16) % self.buckets
+                   for tok in re.findall(r"\w+", text.lower())]
+            if ids:
+                out[i] = self.projection[ids].sum(axis=0)
+        if normalize_embeddings:
+            out /= np.maximum(np.linalg.norm(out, axis=1, keepdims=True), 1e-12)
+        return out[0] if single else out
+
+
+def generate_project(n_regions: int, root: str, seed: int = 0):
+    """Write data/Povertylines.xlsx and data/demographic_district_wise.xlsx with n_regions regions."""
+    rng = np.random.default_rng(seed)
+    os.makedirs(os.path.join(root, "data"), exist_ok=True)
+    names = [f"Region {i:06d}" for i in range(n_regions)]
+
+    periods = [f"{y} {m}" for y in (2024, 2025) for m in MONTHS][:21]
+    base = rng.integers(14000, 19000, n_regions)
+    drift = np.cumsum(rng.integers(-150, 150, (n_regions, len(periods))), axis=1)
+    poverty = pd.DataFrame(base[:, None] + drift, columns=periods)
+    poverty.insert(0, "District", names)
+    poverty.to_excel(os.path.join(root, "data", "Povertylines.xlsx"), index=False)
+
+    # Two DS-division rows per region, as in the real demographic workbook
+    districts = np.repeat(names, 2)
+    pop = rng.integers(5_000, 500_000, len(districts))
+    area = rng.uniform(20, 2000, len(districts)).round(1)
+    demo = pd.DataFrame({
+        "DISTRICT_N": districts,
+        "PPROJ_22": pop,
+        "TOT_POP": pop,
+        "MALE": pop // 2,
+        "FEMALE": pop - pop // 2,
+        "AREA": area,
+        "POP_DENSITY": (pop / area).round(2),
+    })
+    demo.to_excel(os.path.join(root, "data", "demographic_district_wise.xlsx"), index=False)
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def _latencies(fn, items) -> dict:
+    samples = []
+    for item in items:
+        t0 = time.perf_counter()
+        fn(item)
+        samples.append(time.perf_counter() - t0)
+    ms = np.asarray(samples) * 1000
+    return {
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "throughput_qps": float(len(ms) / (ms.sum() / 1000)),
+    }
+
+
+def _concurrent(fn, items, sessions: int) -> dict:
+    """Latencies of fn over items issued by `sessions` threads at once, like concurrent UI sessions."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from service.execution_policy import Overloaded
+
+    def timed(item):
+        t0 = time.perf_counter()
+        try:
+            fn(item)
+        except Overloaded:
+            return None
+        return time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        samples = list(pool.map(timed, items))
+    wall = time.perf_counter() - t0
+    ms = np.asarray([s for s in samples if s is not None]) * 1000
+    return {
+        "sessions": sessions,
+        "p50_ms": float(np.percentile(ms, 50)) if ms.size else None,
+        "p99_ms": float(np.percentile(ms, 99)) if ms.size else None,
+        "throughput_qps": float(ms.size / wall),
+        "shed": samples.count(None),
+    }
+
+
+def run_size(n_regions: int, n_queries: int, sessions: int = 16) -> dict:
+    """All stages for one corpus size, in this process."""
+    from dataloader.dataset_registry import DatasetRegistry, get_registry
+    from signals.nlp_signals import NLPQuerySignal
+
+    root = tempfile.mkdtemp(prefix=f"dsgp-bench-{n_regions}-")
+    stages = {}
+    _, t = _timed(lambda: generate_project(n_regions, root))
+    stages["generate_workbooks"] = {"seconds": t}
+
+    def fresh_registry() -> DatasetRegistry:
+        registry = get_registry(root)
+        registry.register("model", lambda r: HashingEncoder(), replace=True, reloadable=False)
+        registry.invalidate()
+        return registry
+
+    from dataloader.poverty_data_loader import PovertyDataLoader
+    for label in ("cold", "warm"):
+        # cold: parses the workbooks and writes the snapshots; warm: reads the snapshots
+        registry = fresh_registry()
+        _, t = _timed(lambda: PovertyDataLoader(root, registry=registry).load())
+        stages[f"poverty_loader_{label}"] = {"seconds": t, "peak_rss_mb": _peak_rss_mb()}
+
+    from agents.nlp_recommendation_agent import NLPRecommendationAgent
+    for label in ("cold", "warm"):
+        # cold: encodes the corpus into the embedding store; warm: maps the stored matrix
+        registry = fresh_registry()
+        agent, t = _timed(lambda: NLPRecommendationAgent(root, registry=registry))
+        stages[f"recommender_init_{label}"] = {"seconds": t, "peak_rss_mb": _peak_rss_mb()}
+
+    queries = [f"{QUERIES[i % len(QUERIES)]} {i}" for i in range(n_queries)]
+    stages["recommender_invoke"] = {
+        **_latencies(lambda q: agent.invoke(NLPQuerySignal(preference=q)), queries),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    batches = [[NLPQuerySignal(preference=q) for q in queries[i:i + 32]] for i in range(0, len(queries), 32)]
+    lat = _latencies(agent.batch, batches)
+    stages["recommender_batch32"] = {**lat, "throughput_qps": lat["throughput_qps"] * 32}
+
+    from agents.insight_generator_agent import InsightGeneratorAgent
+    insight_agent, t = _timed(lambda: InsightGeneratorAgent(root, registry=registry))
+    stages["insights_init"] = {"seconds": t, "peak_rss_mb": _peak_rss_mb()}
+    from signals.insight_signals import InsightQuerySignal
+    districts = agent.df["District"].sample(min(n_queries, len(agent.df)), replace=True, random_state=0).tolist()
+    stages["insights_invoke"] = _latencies(lambda d: insight_agent.invoke(InsightQuerySignal(district=d)), districts)
+
+    from service.recommendation_service import RecommendationService
+    fresh_registry()
+    service, t = _timed(lambda: RecommendationService(project_root=root))
+    stages["service_construct"] = {"seconds": t}
+    _, t = _timed(lambda: service.get_recommendations("low poverty high population"))
+    stages["service_first_response"] = {"seconds": t, "peak_rss_mb": _peak_rss_mb()}
+    # Distinct preferences miss the result cache, so every request reaches the encoder pool
+    stages["service_concurrent"] = {
+        **_concurrent(service.get_recommendations, [f"{q} session" for q in queries], sessions),
+        **{k: service.execution_stats()[k] for k in ("workers", "torch_threads", "max_queue")},
+    }
+
+    return {"regions": n_regions, "queries": n_queries, "stages": stages, "peak_rss_mb": _peak_rss_mb()}
+
+
+def _commit() -> str:
+    out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=PROJECT_ROOT)
+    return out.stdout.strip() or "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25, 1_000, 10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--sessions", type=int, default=16, help="concurrent sessions in the service_concurrent stage")
+    parser.add_argument("--out", help="JSON output path (default: bench_results/<timestamp>-<commit>.json)")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        print(json.dumps(run_size(args.worker, args.queries, args.sessions)))
+        return
+
+    results = {"commit": _commit(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "encoder": repr(HashingEncoder()),
+               "sizes": []}
+    for n in args.sizes:
+        # One interpreter per size so peak RSS and import costs are not shared between sizes
+        proc = subprocess.run([sys.executable, __file__, "--worker", str(n), "--queries", str(args.queries),
+                               "--sessions", str(args.sessions)],
+                              capture_output=True, text=True, cwd=PROJECT_ROOT)
+        if proc.returncode != 0:
+            results["sizes"].append({"regions": n, "error": proc.stderr.strip().splitlines()[-1]})
+        else:
+            results["sizes"].append(json.loads(proc.stdout.strip().splitlines()[-1]))
+        print(json.dumps(results["sizes"][-1], indent=2))
+
+    out = args.out or os.path.join(PROJECT_ROOT, "bench_results", f"{time.strftime('%Y%m%d-%H%M%S')}-{results['commit']}.json")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""Build every derived artifact ahead of time into artifacts/<version>/ and point artifacts/CURRENT at it.
+
+    python script/build_artifacts.py [--workers 4] [--shard-rows 4096] [--keep 3]
+
+Workbooks are parsed in parallel worker processes. The parent then derives the merged district
+table, child-case frames and poverty insight payloads, and the worker pool encodes every
+domain's embedding shard straight into one memory-mapped matrix per domain. Serving processes
+(DatasetRegistry / NLPRecommendationAgent / DomainPipeline) read or memory-map the finished
+files instead of rebuilding them, and fall back to their regular loaders once a workbook changes.
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# The build itself must read the workbooks, never a previous build or the district database
+os.environ["DSGP_ARTIFACTS"] = "0"
+os.environ.pop("DSGP_DISTRICT_DB", None)
+
+from dataloader.artifacts import ARTIFACTS_DIR, CURRENT, FORMAT, read_dataset, source_fingerprints, write_dataset
+from dataloader.dataset_registry import get_registry
+from utils.embedding_store import EmbeddingStore, model_identity, text_key
+from utils.payloads import unfreeze
+
+# Registry datasets read straight from one workbook each: parsed in parallel
+RAW = {
+    "poverty_lines": "Povertylines.xlsx",
+    "demographics": "demographic_district_wise.xlsx",
+    "child_cases": "childcases.xlsx",
+    "mental_health": "mental_health.xlsx",
+}
+
+
+def _register_loaders(project_root, registry):
+    from dataloader.child_case_data_loader import ChildCaseDataLoader
+    from dataloader.insight.child_cases_insights import ChildCasesInsightsDataLoader
+    from dataloader.insight.poverty_insights import PovertyInsightsDataLoader
+    from dataloader.mental_helalth_data_loader import MentalHealthDataLoader
+    from dataloader.poverty_data_loader import PovertyDataLoader
+
+    PovertyDataLoader(project_root, registry=registry)
+    PovertyInsightsDataLoader(project_root, registry=registry)
+    ChildCaseDataLoader(project_root, registry=registry)
+    ChildCasesInsightsDataLoader(project_root, registry=registry)
+    MentalHealthDataLoader(project_root, registry=registry)
+
+
+def build_raw(project_root, name, out_dir):
+    """Worker: parse one workbook through its registry loader and write the result."""
+    registry = get_registry(project_root)
+    _register_loaders(project_root, registry)
+    t0 = time.perf_counter()
+    entry = write_dataset(out_dir, name, registry.get(name))
+    entry["seconds"] = round(time.perf_counter() - t0, 3)
+    return entry
+
+
+def encode_shard(project_root, matrix_path, shape, start, texts, threads):
+    """Worker: encode rows [start, start + len(texts)) of one domain into its preallocated matrix."""
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    # One model per worker process, kept by the process-wide registry across shards
+    model = get_registry(project_root).get("model")
+    vectors = model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+    matrix = np.memmap(matrix_path, dtype=np.float32, mode="r+", shape=shape)
+    matrix[start:start + len(texts)] = vectors
+    matrix.flush()
+    return len(texts)
+
+
+def build_derived(project_root, registry, out_dir):
+    from agents.insight_generator_agent import InsightGeneratorAgent
+
+    datasets = {}
+    for name in ("poverty_merged", "poverty_insight_frames", "child_case_frames"):
+        try:
+            datasets[name] = write_dataset(out_dir, name, registry.get(name))
+        except (OSError, KeyError) as exc:
+            print(f"  skipped {name}: {exc}")
+    if "poverty_insight_frames" in datasets:
+        agent = InsightGeneratorAgent(project_root, registry=registry)
+        payloads = {"stats": agent.stats_df, "index": {d: unfreeze(p) for d, p in agent.index.items()}}
+        datasets["poverty_insight_index"] = write_dataset(out_dir, "poverty_insight_index", payloads)
+    return datasets
+
+
+def build_embeddings(project_root, registry, model, model_id, out_dir, pool, shard_rows, threads):
+    from agents.domain_plugins import default_plugins
+
+    jobs = {}
+    for plugin in default_plugins():
+        if not plugin.available(registry):
+            continue
+        try:
+            jobs[plugin.name] = plugin.build_texts(plugin.load(registry))
+        except (OSError, KeyError) as exc:
+            print(f"  skipped {plugin.name} embeddings: {exc}")
+
+    out, pending = {}, []
+    for namespace, texts in jobs.items():
+        if not texts:
+            continue
+        store = EmbeddingStore(os.path.join(out_dir, "embeddings"), model_id, namespace)
+        os.makedirs(store.dir, exist_ok=True)
+        keys = [text_key(t) for t in texts]
+        dim = int(np.asarray(model.encode(texts[:1], convert_to_numpy=True)).shape[1])
+        shape = (len(texts), dim)
+        matrix_path = store.matrix_path(keys, dim)
+        np.memmap(matrix_path, dtype=np.float32, mode="w+", shape=shape).flush()
+        shards = range(0, len(texts), shard_rows)
+        if len(shards) == 1:
+            # Small corpus: not worth loading the model in another process
+            matrix = np.memmap(matrix_path, dtype=np.float32, mode="r+", shape=shape)
+            matrix[:] = model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+            matrix.flush()
+        else:
+            pending += [
+                pool.submit(encode_shard, project_root, matrix_path, shape, start,
+                            texts[start:start + shard_rows], threads)
+                for start in shards
+            ]
+        store.write_meta(keys, dim)
+        out[namespace] = {"rows": len(texts), "dim": dim, "shards": len(shards)}
+    for future in pending:
+        future.result()
+    return out
+
+
+def prune(root, keep):
+    with open(os.path.join(root, CURRENT)) as f:
+        current = f.read().strip()
+    versions = sorted(d for d in os.listdir(root) if os.path.isfile(os.path.join(root, d, "manifest.json")))
+    for version in versions[:-keep] if keep > 0 else []:
+        if version != current:
+            shutil.rmtree(os.path.join(root, version), ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--project-root", default=PROJECT_ROOT)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--shard-rows", type=int, default=4096, help="texts per embedding shard")
+    parser.add_argument("--keep", type=int, default=3, help="finished versions to keep (CURRENT is always kept)")
+    args = parser.parse_args()
+
+    project_root = os.path.abspath(args.project_root)
+    started = time.perf_counter()
+    timings = {}
+    sources = source_fingerprints(project_root)
+
+    registry = get_registry(project_root)
+    t0 = time.perf_counter()
+    model = registry.get("model")
+    model_id = model_identity(model)
+    timings["model"] = time.perf_counter() - t0
+
+    digest = hashlib.sha1(json.dumps([FORMAT, model_id, sources], sort_keys=True).encode("utf-8")).hexdigest()
+    version = f"{time.strftime('%Y%m%d-%H%M%S')}-{digest[:8]}"
+    root = os.path.join(project_root, ARTIFACTS_DIR)
+    staging = os.path.join(root, f".{version}.tmp")
+    os.makedirs(staging)
+
+    threads = max(1, (os.cpu_count() or 1) // args.workers)
+    # spawn: the parent already holds torch threads, which do not survive fork()
+    with ProcessPoolExecutor(args.workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        t0 = time.perf_counter()
+        futures = {
+            name: pool.submit(build_raw, project_root, name, staging)
+            for name, file_name in RAW.items() if file_name in sources
+        }
+        datasets = {}
+        for name, future in futures.items():
+            try:
+                datasets[name] = future.result()
+            except (OSError, KeyError, ValueError) as exc:
+                print(f"  skipped {name}: {exc}")
+        timings["workbooks"] = time.perf_counter() - t0
+
+        # Derived datasets read the freshly written raw ones instead of re-parsing the workbooks
+        for name, entry in datasets.items():
+            registry.register(name, lambda r, e=entry: read_dataset(staging, e), replace=True)
+        _register_loaders(project_root, registry)
+        t0 = time.perf_counter()
+        datasets.update(build_derived(project_root, registry, staging))
+        timings["derived"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        embeddings = build_embeddings(project_root, registry, model, model_id, staging, pool, args.shard_rows, threads)
+        timings["embeddings"] = time.perf_counter() - t0
+
+    timings["total"] = time.perf_counter() - started
+    manifest = {
+        "format": FORMAT,
+        "version": version,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "model_id": model_id,
+        "sources": sources,
+        "datasets": datasets,
+        "embeddings": embeddings,
+        "timings_s": {k: round(v, 3) for k, v in timings.items()},
+    }
+    with open(os.path.join(staging, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(staging, os.path.join(root, version))
+    tmp = os.path.join(root, f"{CURRENT}.{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        f.write(version + "\n")
+    os.replace(tmp, os.path.join(root, CURRENT))
+    prune(root, args.keep)
+
+    print(f"Built {version}: {', '.join(sorted(datasets))}; embeddings for {', '.join(embeddings) or 'none'}")
+    print(json.dumps(manifest["timings_s"]))
+
+
+if __name__ == "__main__":
+    main()
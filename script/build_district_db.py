@@ -0,0 +1,59 @@
+"""Load the poverty and demographic workbooks into the indexed SQLite district database.
+
+    python script/build_district_db.py [--db db/districts.sqlite3] [--embeddings]
+
+Serve from it with DSGP_DISTRICT_DB=db/districts.sqlite3: insight payloads, trends and top-N
+lists are then queried per request instead of holding every workbook in memory. The database is
+a snapshot; re-run this after the workbooks change (hot reload only re-opens it).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Read the workbooks, not an existing database
+os.environ.pop("DSGP_DISTRICT_DB", None)
+
+from dataloader.artifacts import source_fingerprints
+from dataloader.dataset_registry import get_registry
+from dataloader.district_repository import FrameDistrictRepository
+from db.district_store import DEFAULT_PATH, SqliteDistrictStore
+from utils.embedding_store import model_identity
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--project-root", default=PROJECT_ROOT)
+    parser.add_argument("--db", default=DEFAULT_PATH)
+    parser.add_argument("--embeddings", action="store_true", help="also encode and store the district texts")
+    args = parser.parse_args()
+
+    project_root = os.path.abspath(args.project_root)
+    registry = get_registry(project_root)
+    source = FrameDistrictRepository(registry)
+    store = SqliteDistrictStore(args.db)
+
+    t0 = time.perf_counter()
+    store.ingest(source, meta={
+        "sources": json.dumps(source_fingerprints(project_root)),
+        "built": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    })
+    print(f"Ingested {len(store.districts())} districts x {len(store.periods())} periods "
+          f"into {args.db} in {time.perf_counter() - t0:.2f}s")
+
+    if args.embeddings:
+        model = registry.get("model")
+        texts = store.merged()["text"].tolist()
+        store.embedding_store(model_identity(model), "poverty").get_or_encode(
+            texts, lambda batch: model.encode(batch, convert_to_numpy=True, normalize_embeddings=True)
+        )
+        print(f"Stored {len(texts)} embeddings")
+
+
+if __name__ == "__main__":
+    main()
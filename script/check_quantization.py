@@ -0,0 +1,95 @@
+"""Compare the int8 query encoder against fp32 on a fixed query set.
+
+Reports, per query, the cosine between the fp32 and int8 query embeddings and the top-10 overlap,
+plus the median encode latency of each encoder:
+
+    python script/check_quantization.py [--k 10] [--out quantization.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from dataloader.dataset_registry import get_registry
+from agents.nlp_recommendation_agent import NLPRecommendationAgent
+from agents.structured_preferences import parse_preference
+from signals.nlp_signals import NLPQuerySignal
+
+# Only preferences that reach the encoder: fully structured ones ("low poverty") are ranked on the
+# numeric columns alone and would compare equal whatever the encoder does
+QUERIES = [q for q in [
+    "rural areas with high poverty",
+    "urban areas",
+    "densely populated coastal towns",
+    "districts in the north",
+    "coastal districts",
+    "hill country tea estates",
+    "fishing communities in the east",
+    "industrial zones near the capital",
+    "Colombo",
+    "Jaffna",
+] if not parse_preference(q).fully_structured]
+
+
+def _encode(agent, query):
+    return agent.query_model.encode([query], convert_to_numpy=True, normalize_embeddings=True)[0]
+
+
+def _timed_encode(agent):
+    vectors, elapsed = [], []
+    for query in QUERIES:
+        t0 = time.perf_counter()
+        vectors.append(_encode(agent, query))
+        elapsed.append(time.perf_counter() - t0)
+    return np.stack(vectors), elapsed
+
+
+def _topk(agent, k):
+    return [agent.invoke(NLPQuerySignal(preference=query, k=k)).district.tolist() for query in QUERIES]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--out", help="write the report to this JSON file")
+    args = parser.parse_args()
+
+    registry = get_registry(PROJECT_ROOT)
+    fp32 = NLPRecommendationAgent(PROJECT_ROOT, registry=registry)
+    int8 = NLPRecommendationAgent(PROJECT_ROOT, registry=registry, quantized_encoder=True)
+
+    fp32_q, fp32_t = _timed_encode(fp32)
+    int8_q, int8_t = _timed_encode(int8)
+    cosine = dict(zip(QUERIES, (fp32_q * int8_q).sum(axis=1).tolist()))
+
+    overlap = {
+        q: len(set(a) & set(b)) / max(len(a), 1)
+        for q, a, b in zip(QUERIES, _topk(fp32, args.k), _topk(int8, args.k))
+    }
+    report = {
+        "k": args.k,
+        "mean_embedding_cosine": float(np.mean(list(cosine.values()))),
+        "min_embedding_cosine": float(np.min(list(cosine.values()))),
+        "per_query_embedding_cosine": cosine,
+        "mean_overlap": float(np.mean(list(overlap.values()))),
+        "min_overlap": float(np.min(list(overlap.values()))),
+        "per_query_overlap": overlap,
+        "fp32_encode_ms_p50": float(np.median(fp32_t) * 1000),
+        "int8_encode_ms_p50": float(np.median(int8_t) * 1000),
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Convert model/poverty_model.pkl into the safetensors artifact directory read by load_model.
+
+    python script/export_model.py [--out model/poverty_model]
+"""
+import argparse
+import os
+import pickle
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from dataloader.model_loader import ARTIFACT_DIR, PICKLE_PATH, export_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pickle", default=os.path.join(PROJECT_ROOT, PICKLE_PATH))
+    parser.add_argument("--out", default=os.path.join(PROJECT_ROOT, ARTIFACT_DIR))
+    args = parser.parse_args()
+
+    with open(args.pickle, "rb") as f:
+        model = pickle.load(f)
+    export_model(model, args.out)
+    print(f"Exported {type(model).__name__} to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
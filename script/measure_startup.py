@@ -0,0 +1,149 @@
+"""Time-to-first-response of the service entry points.
+
+Each measurement runs in a fresh interpreter, so import costs are included:
+
+    python script/measure_startup.py                       # prints JSON
+    python script/measure_startup.py --out startup.json
+    python script/measure_startup.py --compare HEAD~1      # before (a git worktree at REV) and after
+    python script/measure_startup.py --stand-in-model 25   # model-backed paths without torch
+
+Entry points:
+- ui_first_paint, first_recommendation, first_insight, warmup_blocking: RecommendationService as
+  the Streamlit pages use it
+- api_import: importing app.py (FastAPI app, router and its module-level service)
+- api_first_request: app startup (lifespan warmup) plus the first POST /api/recommend
+
+--stand-in-model N measures git worktrees (HEAD, and REV with --compare) on a synthetic project of
+N regions (script.benchmark.generate_project), with script.benchmark.HashingEncoder registered as
+the model before the clock starts. The model-backed entry points then time everything except
+loading and running the sentence-transformer; pandas is imported before t0 and left out of import_s.
+"""
+import argparse
+import inspect
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# The encoder's source is inlined and register() is called without the newer reloadable flag, so
+# older revisions without script/benchmark.py can be measured too
+STAND_IN = r"""
+import hashlib, re
+import numpy as np
+{encoder}
+from dataloader.dataset_registry import get_registry
+get_registry({root!r}).register("model", lambda r: HashingEncoder(), replace=True)
+"""
+
+PROBE = r"""
+import json, sys, time
+sys.path.insert(0, {root!r})
+{prelude}
+t0 = time.perf_counter()
+{setup}
+t_import = time.perf_counter()
+{construct}
+t_init = time.perf_counter()
+{action}
+t_first = time.perf_counter()
+print(json.dumps({{
+    "import_s": t_import - t0,
+    "construct_s": t_init - t_import,
+    "first_response_s": t_first - t_init,
+    "total_s": t_first - t0,
+}}))
+"""
+
+SERVICE = {
+    "setup": "from service.recommendation_service import RecommendationService",
+    "construct": "service = RecommendationService()",
+}
+API = {
+    "setup": "from app import app\nfrom fastapi.testclient import TestClient",
+    # Entering the client runs the lifespan hook (background warmup), as uvicorn does at startup
+    "construct": "client = TestClient(app).__enter__()",
+}
+
+ENTRY_POINTS = {
+    # What the Streamlit pages need before their first paint
+    "ui_first_paint": dict(SERVICE, action="pass"),
+    "first_recommendation": dict(SERVICE, action="service.get_recommendations('low poverty high population')"),
+    "first_insight": dict(SERVICE, action="service.get_insights('Colombo')"),
+    "warmup_blocking": dict(SERVICE, action="service.warmup(background=False)"),
+    "api_import": dict(API, construct="pass", action="pass"),
+    "api_first_request": dict(
+        API, action="assert client.post('/api/recommend', json={'preference': 'coastal districts'}).status_code == 200"
+    ),
+}
+
+
+def measure(root: str, entry: dict, stand_in: bool = False) -> dict:
+    prelude = ""
+    if stand_in:
+        from script.benchmark import HashingEncoder
+
+        prelude = STAND_IN.format(root=root, encoder=inspect.getsource(HashingEncoder))
+    code = PROBE.format(root=root, prelude=prelude, **entry)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=root)
+    if out.returncode != 0:
+        return {"error": out.stderr.strip().splitlines()[-1] if out.stderr.strip() else "failed"}
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure_all(root: str, stand_in: bool = False) -> dict:
+    return {name: measure(root, entry, stand_in) for name, entry in ENTRY_POINTS.items()}
+
+
+def measure_revision(rev: str, stand_in_regions: int = None) -> dict:
+    """measure_all() on a detached worktree of rev: the synthetic project if stand_in_regions is set,
+    else data/ and model/ linked from this checkout."""
+    tmp = tempfile.mkdtemp(prefix="dsgp-startup-")
+    worktree = os.path.join(tmp, "tree")
+    subprocess.run(["git", "worktree", "add", "--detach", worktree, rev], cwd=PROJECT_ROOT, check=True,
+                   capture_output=True)
+    try:
+        if stand_in_regions:
+            from script.benchmark import generate_project
+
+            generate_project(stand_in_regions, worktree)
+        else:
+            for name in ("data", "model"):
+                src, dst = os.path.join(PROJECT_ROOT, name), os.path.join(worktree, name)
+                if os.path.isdir(src) and not os.path.exists(dst):
+                    os.symlink(src, dst)
+        return measure_all(worktree, bool(stand_in_regions))
+    finally:
+        subprocess.run(["git", "worktree", "remove", "--force", worktree], cwd=PROJECT_ROOT, capture_output=True)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--compare", metavar="REV", help="also measure REV (before) next to this checkout (after)")
+    parser.add_argument("--stand-in-model", type=int, metavar="N",
+                        help="synthetic project of N regions with a hashing encoder instead of the model")
+    args = parser.parse_args()
+
+    # The synthetic project never overwrites this checkout's data/: it is measured in a worktree of HEAD
+    if args.stand_in_model:
+        results = measure_revision("HEAD", args.stand_in_model)
+    else:
+        results = measure_all(PROJECT_ROOT)
+    if args.compare:
+        results = {"before": measure_revision(args.compare, args.stand_in_model), "after": results}
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Resident size of every poverty/demographic frame, read as-is vs. with the declared schemas.
+
+    python script/memory_report.py [--project-root .] [--json]
+
+"before" reads every column with pandas' default dtypes, "after" goes through
+dataloader/schemas.py (pruned columns, categorical districts, downcast counts).
+"""
+import argparse
+import json
+import os
+import sys
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from dataloader.dataset_registry import DatasetRegistry
+from dataloader.insight.poverty_insights import build_insight_frames
+from dataloader.poverty_data_loader import build_merged_df
+from dataloader.schemas import DEMOGRAPHICS, POVERTY_LINES, frame_bytes, read_source
+
+SOURCES = {"poverty_lines": POVERTY_LINES, "demographics": DEMOGRAPHICS}
+DERIVED = {"poverty_merged": build_merged_df, "poverty_insight_frames": build_insight_frames}
+
+
+def _registry(project_root, read):
+    registry = DatasetRegistry(project_root)
+    for name, schema in SOURCES.items():
+        registry.register(name, lambda r, s=schema: read(r.path("data", s.file_name), s))
+    for name, build in DERIVED.items():
+        registry.register(name, build)
+    return registry
+
+
+def report(project_root) -> list:
+    before = _registry(project_root, lambda path, schema: pd.read_excel(path))
+    after = _registry(project_root, read_source)
+    rows = []
+    for name in list(SOURCES) + list(DERIVED):
+        try:
+            b, a = before.get(name), after.get(name)
+        except OSError as exc:
+            print(f"skipped {name}: {exc}", file=sys.stderr)
+            continue
+        frames = b if isinstance(b, dict) else {name: b}
+        for key in frames:
+            fb, fa = (b[key], a[key]) if isinstance(b, dict) else (b, a)
+            rows.append({
+                "frame": key,
+                "rows": len(fa),
+                "columns_before": fb.shape[1],
+                "columns_after": fa.shape[1],
+                "bytes_before": frame_bytes(fb),
+                "bytes_after": frame_bytes(fa),
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--project-root", default=PROJECT_ROOT)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    rows = report(os.path.abspath(args.project_root))
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    df = pd.DataFrame(rows)
+    if df.empty:
+        print("No workbooks found")
+        return
+    df["saved"] = (1 - df["bytes_after"] / df["bytes_before"]).map("{:.0%}".format)
+    print(df.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Memory footprint and recall@k of each corpus storage setting against exact float32 search.
+
+Uses the persisted poverty corpus and the fixed query set when the model is available,
+or a synthetic clustered corpus otherwise:
+
+    python script/precision_report.py
+    python script/precision_report.py --synthetic 100000 --dim 384 --out precision.json
+"""
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.compact_embeddings import PRECISIONS
+from utils.similarity_search import SimilarityIndex
+
+
+def _real_corpus():
+    from agents.nlp_recommendation_agent import NLPRecommendationAgent
+    from script.check_quantization import QUERIES
+
+    agent = NLPRecommendationAgent(PROJECT_ROOT)
+    queries = agent.model.encode(QUERIES, convert_to_numpy=True, normalize_embeddings=True)
+    return np.asarray(agent.index.matrix), queries
+
+
+def _synthetic_corpus(n, dim, n_queries=200, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(n // 100, 1), dim))
+    corpus = centers[rng.integers(0, len(centers), n)] + 0.5 * rng.standard_normal((n, dim))
+    queries = corpus[rng.integers(0, n, n_queries)] + 0.1 * rng.standard_normal((n_queries, dim))
+    return corpus.astype(np.float32), queries.astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--synthetic", type=int, help="number of synthetic rows instead of the real corpus")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--dims", type=int, nargs="*", default=[0, 256, 128, 64], help="0 keeps every component")
+    parser.add_argument("--out", help="write the report to this JSON file")
+    args = parser.parse_args()
+
+    corpus, queries = _synthetic_corpus(args.synthetic, args.dim) if args.synthetic else _real_corpus()
+    reference = SimilarityIndex(corpus, backend="exact")
+    truth = [set(reference.search(q, args.k)[0]) for q in queries]
+
+    report = []
+    for precision in PRECISIONS:
+        for dims in args.dims:
+            dims = dims or None
+            if dims is not None and dims >= corpus.shape[1]:
+                continue
+            index = SimilarityIndex(corpus, backend="exact", precision=precision, dims=dims)
+            found = [set(index.search(q, args.k)[0]) for q in queries]
+            recall = np.mean([len(t & f) / max(len(t), 1) for t, f in zip(truth, found)])
+            report.append({
+                "precision": precision,
+                "dims": dims or corpus.shape[1],
+                "bytes": int(index.nbytes),
+                "bytes_per_row": index.nbytes / len(corpus),
+                f"recall@{args.k}": float(recall),
+            })
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import os
+
+from dataloader.insight.child_cases_insights import ChildCasesInsightsDataLoader
+from service.execution_policy import shared_execution_policy
+from service.query_cache import shared_query_cache
+from signals.domain_signals import DomainQuerySignal
+
+
+class ChildProtectionService:
+    def __init__(self):
+        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+        self.project_root = project_root
+        self.loader = ChildCasesInsightsDataLoader(project_root)
+        self._pipeline = None
+
+    @property
+    def pipeline(self):
+        # Built on first search only: the case tables above need no model
+        if self._pipeline is None:
+            from agents.domain_pipeline import get_domain_pipeline
+            self._pipeline = get_domain_pipeline(self.project_root, query_cache=shared_query_cache(),
+                                                 policy=shared_execution_policy())
+        return self._pipeline
+
+    def get_recommendations(self, preference: str, k: int = 10):
+        signal = DomainQuerySignal(preference=preference, domains=["child_protection"], k=k)
+        return {"recommendations": self.pipeline.invoke(signal).results["child_protection"]}
+
+    def get_case_trend(self, district: str) -> dict:
+        frames = self.loader.load()
+        cases_df = frames["cases_df"]
+        if district not in cases_df.index:
+            return {"available": False, "trend": {}, "provisional": frames["provisional"]}
+        return {
+            "available": True,
+            "trend": cases_df.loc[district].dropna().to_dict(),
+            "provisional": frames["provisional"],
+        }
+
+    def get_summary(self, districts=None):
+        summary_df = self.loader.load()["summary_df"]
+        return summary_df if districts is None else summary_df.reindex(list(districts))
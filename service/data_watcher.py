@@ -0,0 +1,59 @@
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class DataWatcher:
+    """Polls a data directory and calls on_change(changed_paths) when workbooks are added, edited or removed."""
+
+    def __init__(self, data_dir: str, on_change, interval: float = 2.0, extensions=(".xlsx", ".xls", ".csv")):
+        self.data_dir = data_dir
+        self.on_change = on_change
+        self.interval = interval
+        self.extensions = extensions
+        self._seen = self._scan()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _scan(self) -> dict:
+        stats = {}
+        for name in os.listdir(self.data_dir):
+            # Skip Office lock files (~$book.xlsx) and hidden entries such as .snapshots
+            if name.startswith(("~$", ".")) or not name.endswith(self.extensions):
+                continue
+            path = os.path.join(self.data_dir, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            stats[path] = (st.st_size, st.st_mtime_ns)
+        return stats
+
+    def check(self):
+        current = self._scan()
+        changed = sorted(p for p in set(current) | set(self._seen) if current.get(p) != self._seen.get(p))
+        self._seen = current
+        if changed:
+            logger.info("Data files changed: %s", changed)
+            self.on_change(changed)
+        return changed
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                # A half-written workbook fails to parse: keep serving the old data and retry next tick
+                logger.exception("Reloading data failed")
+                self._seen = {}
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="data-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
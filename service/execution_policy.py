@@ -0,0 +1,139 @@
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from utils import tracing
+
+
+class Overloaded(RuntimeError):
+    """The request was shed: the encoder queue is full or it waited longer than the queue timeout."""
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+class ExecutionPolicy:
+    """Admission control for encoder work shared by every session of a process.
+
+    - a fixed pool of `workers` threads runs forward passes, so at most that many run at once
+    - torch's intra-op pool gets `torch_threads` threads (default: cores / workers), so the
+      passes together use every core without oversubscribing them
+    - at most `max_queue` requests wait for a worker; beyond that submit() sheds the request
+      immediately, and a request that waited longer than `queue_timeout_ms` is dropped unrun
+      instead of adding latency for a caller that has likely given up
+
+    Queue depth, in-flight passes and shed counts are exported through utils.tracing gauges;
+    queue waits go to the "encoder.queue_wait" histogram.
+    """
+
+    def __init__(self, workers: int = None, torch_threads: int = None, max_queue: int = None,
+                 queue_timeout_ms: float = None):
+        self.workers = workers or _env_int("DSGP_ENCODER_WORKERS", 2)
+        self.torch_threads = torch_threads or _env_int(
+            "DSGP_TORCH_THREADS", max(1, (os.cpu_count() or 1) // self.workers)
+        )
+        self.max_queue = max_queue if max_queue is not None else _env_int("DSGP_ENCODER_QUEUE", 8 * self.workers)
+        self.queue_timeout = (
+            queue_timeout_ms if queue_timeout_ms is not None else _env_int("DSGP_ENCODER_QUEUE_TIMEOUT_MS", 5000)
+        ) / 1000.0
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="encoder", initializer=self._init_worker
+        )
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        tracing.register_collector(self._metrics)
+
+    def _init_worker(self):
+        self._local.worker = True
+        try:
+            import torch
+            # Process-wide setting; every worker sets the same value
+            torch.set_num_threads(self.torch_threads)
+        except ImportError:
+            pass
+
+    def submit(self, fn, *args) -> Future:
+        """Queue fn(*args) for an encoder worker; raises Overloaded if the queue is full."""
+        with self._lock:
+            # Idle workers take requests at once; only requests beyond them count as waiting
+            if self.queued + self.running >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise Overloaded(f"Encoder queue full ({self.max_queue} waiting)")
+            self.queued += 1
+        # Run in the caller's context so the job's spans land in the caller's active trace
+        return self._pool.submit(contextvars.copy_context().run, self._run, time.perf_counter(), fn, args)
+
+    def run(self, fn, *args):
+        """submit() and wait for the result; calls made from a worker run inline (no self-deadlock)."""
+        if getattr(self._local, "worker", False):
+            return fn(*args)
+        return self.submit(fn, *args).result()
+
+    def _run(self, queued_at: float, fn, args):
+        waited = time.perf_counter() - queued_at
+        with self._lock:
+            self.queued -= 1
+            if waited > self.queue_timeout:
+                self.timed_out += 1
+                stale = True
+            else:
+                self.running += 1
+                stale = False
+        tracing.observe("encoder.queue_wait", waited * 1000)
+        if stale:
+            raise Overloaded(f"Waited {waited * 1000:.0f} ms for an encoder worker")
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "torch_threads": self.torch_threads,
+                "max_queue": self.max_queue,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+            }
+
+    def _metrics(self) -> dict:
+        stats = self.stats()
+        return {
+            "encoder_queue_depth": stats["queued"],
+            "encoder_in_flight": stats["running"],
+            "encoder_completed_total": stats["completed"],
+            "encoder_rejected_total": stats["rejected"],
+            "encoder_timed_out_total": stats["timed_out"],
+        }
+
+    def shutdown(self, wait: bool = False):
+        self._pool.shutdown(wait=wait)
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_execution_policy() -> ExecutionPolicy:
+    """Process-wide policy: every service in a process shares one encoder pool and queue."""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = ExecutionPolicy()
+    return _shared
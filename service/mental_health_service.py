@@ -0,0 +1,30 @@
+import os
+
+from agents.domain_pipeline import get_domain_pipeline
+from service.execution_policy import shared_execution_policy
+from service.query_cache import shared_query_cache
+from signals.domain_signals import DomainQuerySignal
+from signals.nlp_signals import RecommendationSignal
+
+
+class MentalHealthService:
+    def __init__(self):
+        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+        # Same encoder, embedding store and query cache as every other domain
+        self.pipeline = get_domain_pipeline(project_root, query_cache=shared_query_cache(),
+                                            policy=shared_execution_policy())
+
+    @property
+    def available(self) -> bool:
+        # Re-checked after every reload: the domain switches on once its workbook appears
+        return "mental_health" in self.pipeline.domains()
+
+    def get_recommendations(self, preference: str, k: int = 10):
+        if not self.available:
+            return {"recommendations": RecommendationSignal.from_columns({"row": [], "District": [], "score": []}),
+                    "available": False}
+        signal = DomainQuerySignal(preference=preference, domains=["mental_health"], k=k)
+        return {"recommendations": self.pipeline.invoke(signal).results["mental_health"], "available": True}
+
+    def get_insights(self, district: str):
+        return self.pipeline.insights("mental_health", district) if self.available else None
@@ -0,0 +1,102 @@
+import numpy as np
+
+from db.query_cache_store import DEFAULT_PATH, SqliteQueryCacheStore
+from utils.lru_cache import LRUCache
+
+
+def normalize_query(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class QueryCache:
+    """Two in-memory LRU tiers for repeated preferences, with an optional SQLite tier behind them.
+
+    - query embeddings, keyed by (encoder id, normalized text)
+    - ranked results, keyed by (normalized text, k, result key)
+
+    The result key (NLPRecommendationAgent.result_key) identifies the corpus contents, the query
+    encoder and the index options, so results computed on older data or by differently configured
+    agents never match; stale entries age out of the LRU.
+    """
+
+    def __init__(self, embedding_size: int = 4096, result_size: int = 1024, persistent: bool = False,
+                 path: str = DEFAULT_PATH):
+        self.embeddings = LRUCache(embedding_size)
+        self.results = LRUCache(result_size)
+        self.store = SqliteQueryCacheStore(path) if persistent else None
+        self.store_hits = 0
+        # model id -> embedding width, so an empty request still gets a (0, dim) array
+        self._dims = {}
+
+    def encode(self, model_id: str, texts, encode_fn) -> np.ndarray:
+        """Embeddings for texts, running encode_fn once for all the misses."""
+        if not len(texts):
+            return np.empty((0, self._dims.get(model_id, 0)), dtype=np.float32)
+        queries = [normalize_query(t) for t in texts]
+        vectors = [self.embeddings.get((model_id, q)) for q in queries]
+
+        if self.store is not None:
+            for i, q in enumerate(queries):
+                if vectors[i] is None:
+                    vectors[i] = self.store.get_embedding(model_id, q)
+                    if vectors[i] is not None:
+                        self.store_hits += 1
+                        self.embeddings.put((model_id, q), vectors[i])
+
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        if missing:
+            # Encode each distinct query once, even if it repeats within the batch. Only the cache key is
+            # normalized: the encoder gets the text as the user typed it (first spelling seen)
+            distinct = {}
+            for i in missing:
+                distinct.setdefault(queries[i], texts[i])
+            fresh = dict(zip(distinct, np.asarray(encode_fn(list(distinct.values())), dtype=np.float32)))
+            for q, v in fresh.items():
+                self.embeddings.put((model_id, q), v)
+                if self.store is not None:
+                    self.store.put_embedding(model_id, q, v)
+            for i in missing:
+                vectors[i] = fresh[queries[i]]
+        out = np.stack(vectors)
+        self._dims[model_id] = out.shape[1]
+        return out
+
+    def get_result(self, query: str, k: int, result_key: str, decode=None):
+        """Cached result or None; decode turns a result read back from the SQLite tier (plain JSON) into
+        the in-memory form."""
+        # No clearing on a new key: callers still on the previous data version (mid-reload) keep their hits
+        key = (normalize_query(query), k, result_key)
+        result = self.results.get(key)
+        if result is None and self.store is not None:
+            result = self.store.get_result(*key)
+            if result is not None:
+                self.store_hits += 1
+                if decode is not None:
+                    result = decode(result)
+                self.results.put(key, result)
+        return result
+
+    def put_result(self, query: str, k: int, result_key: str, result):
+        key = (normalize_query(query), k, result_key)
+        self.results.put(key, result)
+        if self.store is not None:
+            self.store.put_result(*key, result)
+
+    def stats(self) -> dict:
+        return {
+            "query_embeddings": self.embeddings.stats(),
+            "results": self.results.stats(),
+            "persistent": self.store is not None,
+            "persistent_hits": self.store_hits,
+        }
+
+
+_shared = None
+
+
+def shared_query_cache() -> QueryCache:
+    """Process-wide in-memory cache used by every service that does not need its own."""
+    global _shared
+    if _shared is None:
+        _shared = QueryCache()
+    return _shared
@@ -1,26 +1,148 @@
+import os
+import threading
 
+from service.data_watcher import DataWatcher
+from service.execution_policy import shared_execution_policy
+from service.query_cache import QueryCache, shared_query_cache
+from utils import tracing
+from utils.micro_batcher import MicroBatcher
+
+DEFAULT_K = 10
+
+
+def _decode_result(result: dict) -> dict:
+    # Imported here like the coordinator: constructing the service stays free of pandas and pydantic
+    from signals.nlp_signals import RecommendationSignal
+
+    return {**result, "recommendations": RecommendationSignal.from_columns(result["recommendations"])}
 
-# from agents.coordinator_agent import CoordinatorAgent
-# import os
-#
-# class RecommendationService:
-#     def __init__(self):
-#         project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-#         self.coordinator = CoordinatorAgent(project_root)
-#
-#     def get_recommendations(self, preference: str):
-#         return self.coordinator.invoke(preference)
-from agents.coordinator_agent import CoordinatorAgent
-import os
 
 class RecommendationService:
-    def __init__(self):
-        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-        self.coordinator = CoordinatorAgent(project_root)
+    def __init__(self, micro_batch_ms=None, persistent_cache=False, project_root=None, policy=None,
+                 **recommender_options):
+        self.project_root = project_root or os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+        # The coordinator (and with it langchain, torch and the model) is imported on first use
+        self._coordinator = None
+        # e.g. quantized_encoder=True for the int8 query encoder (check drift with script/check_quantization.py)
+        self.recommender_options = recommender_options
+        # Repeated preferences skip the encoder (embedding tier) or the whole search (result tier)
+        self.cache = QueryCache(persistent=True) if persistent_cache else shared_query_cache()
+        self.recommender_options.setdefault("query_cache", self.cache)
+        # Query forward passes go through one bounded encoder pool per process (Overloaded when full);
+        # structured preferences that never encode don't queue behind them
+        self.policy = policy or shared_execution_policy()
+        self.recommender_options.setdefault("policy", self.policy)
+        self._lock = threading.Lock()
+        self.watcher = None
+        tracing.register_collector(self._metrics)
+        # Optional: group single requests from concurrent sessions into one forward pass
+        self.batcher = (
+            MicroBatcher(lambda items: self.coordinator.batch(items), max_wait_ms=micro_batch_ms)
+            if micro_batch_ms else None
+        )
+
+    @property
+    def coordinator(self):
+        if self._coordinator is None:
+            with self._lock:
+                if self._coordinator is None:
+                    from agents.coordinator_agent import CoordinatorAgent
+                    self._coordinator = CoordinatorAgent(self.project_root, **self.recommender_options)
+        return self._coordinator
+
+    def warmup(self, background: bool = True, insights: bool = True):
+        """Load the model, data and agents ahead of the first request.
+
+        With background=True this returns immediately and the returned thread does the work,
+        so a UI can paint (or a worker accept connections) while the model deserializes.
+        """
+        def _run():
+            self.coordinator.warmup(recommender=True, insights=insights)
+
+        if not background:
+            _run()
+            return None
+        thread = threading.Thread(target=_run, name="service-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        """Release process resources held for serving (shared-memory corpus segments)."""
+        if self._coordinator is not None:
+            self._coordinator.close()
+
+    def reload(self, changed=None) -> dict:
+        return self.coordinator.reload()
+
+    def start_watcher(self, interval: float = 2.0) -> DataWatcher:
+        """Hot-reload: re-read data/ in the background whenever a workbook changes."""
+        if self.watcher is None:
+            self.watcher = DataWatcher(os.path.join(self.project_root, "data"), self.reload, interval=interval).start()
+        return self.watcher
+
+    @property
+    def result_key(self) -> str:
+        return self.coordinator.recommender.result_key
+
+    @property
+    def insights_version(self) -> int:
+        """Dataset version behind the insight payloads; changes when a reload picks up new workbooks."""
+        return self.coordinator.insight_generator.data_version
 
     def get_recommendations(self, preference: str):
-        return self.coordinator.invoke(preference)
+        with tracing.trace("recommend"):
+            result_key = self.result_key
+            with tracing.span("cache.lookup"):
+                result = self.cache.get_result(preference, DEFAULT_K, result_key, decode=_decode_result)
+            if result is not None:
+                return result
+            if self.batcher is not None:
+                result = self.batcher(preference)
+            else:
+                result = self.coordinator.invoke(preference)
+            self.cache.put_result(preference, DEFAULT_K, result_key, result)
+            return result
+
+    def get_recommendations_many(self, preferences):
+        preferences = list(preferences)
+        result_key = self.result_key
+        results = [self.cache.get_result(p, DEFAULT_K, result_key, decode=_decode_result) for p in preferences]
+        missing = [i for i, r in enumerate(results) if r is None]
+        if missing:
+            for i, result in zip(missing, self.coordinator.batch([preferences[i] for i in missing])):
+                self.cache.put_result(preferences[i], DEFAULT_K, result_key, result)
+                results[i] = result
+        return results
+
+    def get_insights_many(self, districts):
+        return self.coordinator.get_insights_for_districts(list(districts))
+
+    def get_district_comparison(self, districts):
+        return self.coordinator.compare_districts(list(districts))
+
+    def get_poverty_trend(self, district: str, start: str = None, end: str = None):
+        return self.coordinator.get_poverty_trend(district, start, end)
+
+    def get_top_districts(self, metric: str = "latest", n: int = 10, ascending: bool = False):
+        return self.coordinator.top_districts(metric, n, ascending)
+
+    def cache_stats(self) -> dict:
+        return self.cache.stats()
+
+    def execution_stats(self) -> dict:
+        return self.policy.stats()
+
+    def _metrics(self) -> dict:
+        stats = self.cache.stats()
+        return {
+            "query_embedding_cache_hit_rate": stats["query_embeddings"]["hit_rate"],
+            "query_result_cache_hit_rate": stats["results"]["hit_rate"],
+            "query_cache_persistent_hits": stats["persistent_hits"],
+        }
 
     def get_insights(self, district: str):
         return self.coordinator.get_insights_for_district(district)
 
+    def get_insights_snapshot(self, district: str):
+        """(insights version, payload) of one district; use the version as a cache key for the payload."""
+        return self.coordinator.get_insights_snapshot(district)
@@ -1,8 +1,7 @@
-from pydinamic import BaseModel
+from pydantic import BaseModel
 
 class ChildNLPSignals(BaseModel):
     preference : str
 
 class ChildRecommenderSignals(ChildNLPSignals):
     districts : list
-
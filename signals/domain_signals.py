@@ -0,0 +1,15 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from signals.nlp_signals import RecommendationSignal
+
+class DomainQuerySignal(BaseModel):
+    preference: str
+    # None searches every registered domain with the same query embedding
+    domains: Optional[List[str]] = None
+    k: int = 10
+
+class DomainRecommendationSignal(BaseModel):
+    # Domain name -> its ranked districts, best first
+    results: Dict[str, RecommendationSignal]
@@ -1,7 +1,52 @@
-from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, ConfigDict
 
 class NLPQuerySignal(BaseModel):
     preference: str
+    k: int = 10
+    districts: Optional[List[str]] = None
 
 class RecommendationSignal(BaseModel):
-    districts: list
+    """Ranked districts as parallel, read-only arrays (one entry per result, best first).
+
+    rows are positions in the recommender's corpus frame; score is the ranking score (cosine
+    similarity, the structured score in [0, 1], or their blend).
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True)
+
+    rows: np.ndarray
+    district: np.ndarray
+    score: np.ndarray
+    metrics: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, list]) -> "RecommendationSignal":
+        """Inverse of to_columns() (e.g. a result read back from the persistent query cache)."""
+        columns = dict(columns)
+        return cls(
+            rows=np.asarray(columns.pop("row"), dtype=np.int64),
+            district=np.asarray(columns.pop("District"), dtype=object),
+            score=np.asarray(columns.pop("score"), dtype=np.float64),
+            metrics={name: np.asarray(values, dtype=np.float64) for name, values in columns.items()},
+        )
+
+    def to_columns(self) -> Dict[str, list]:
+        """JSON-ready columns; NaN becomes None."""
+        def plain(values):
+            return [None if v != v else v for v in values.tolist()] if values.dtype.kind == "f" else values.tolist()
+
+        return {
+            "row": self.rows.tolist(),
+            "District": self.district.tolist(),
+            **{name: plain(values) for name, values in self.metrics.items()},
+            "score": plain(self.score),
+        }
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({"District": self.district, **self.metrics, "score": self.score})
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from dataloader.child_case_data_loader import ChildCaseDataLoader
+from dataloader.insight.child_cases_insights import build_child_case_frames
+
+ROWS = [
+    ("NCPA complaints by district",),
+    ("District",),
+    (None, 2021, 2022, "2023*"),
+    ("Colombo", 100, 120, 130),
+    ("Galle", 10.5, "_", 12),
+    ("Unknown", "_", "_", 434),
+    ("Kandy", None, 40, "_"),
+]
+
+
+@pytest.fixture
+def frames():
+    agg = ChildCaseDataLoader.__new__(ChildCaseDataLoader)._aggregate(iter(ROWS))
+    return build_child_case_frames(agg)
+
+
+def test_missing_cells_are_nan_not_zero(frames):
+    cases = frames["cases_df"]
+    assert np.isnan(cases.loc["Unknown", "2021"])
+    assert cases.loc["Galle", "2021"] == 10.5
+
+
+def test_sparse_district_averages_reported_periods_only(frames):
+    summary = frames["summary_df"]
+    # Only final (non-provisional) periods feed the average
+    assert summary.loc["Colombo", "average_cases"] == 110
+    assert summary.loc["Galle", "average_cases"] == 10.5
+    assert summary.loc["Kandy", "average_cases"] == 40
+    # Unknown has nothing but the provisional 2023 value: no average, but the total is kept
+    assert np.isnan(summary.loc["Unknown", "average_cases"])
+    assert summary.loc["Unknown", "total_cases"] == 434
+    assert np.isnan(summary.loc["Kandy", "latest_cases"])
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from utils.compact_embeddings import CompactMatrix, compact
+from utils.similarity_search import SimilarityIndex, normalize_rows
+
+
+@pytest.fixture
+def corpus():
+    rng = np.random.default_rng(0)
+    return normalize_rows(rng.standard_normal((3000, 64)).astype(np.float32)), rng.standard_normal((20, 64))
+
+
+@pytest.mark.parametrize("precision, min_overlap", [("float16", 1.0), ("int8", 0.9)])
+def test_compact_rankings_match_float32(corpus, precision, min_overlap):
+    matrix, queries = corpus
+    reference = SimilarityIndex(matrix)
+    index = SimilarityIndex(matrix, precision=precision)
+    assert index.nbytes < reference.nbytes
+    overlap = np.mean([
+        len(set(reference.search(q, 10)[0]) & set(index.search(q, 10)[0])) / 10 for q in queries
+    ])
+    assert overlap >= min_overlap
+
+
+def test_int8_scores_stay_close_to_float32(corpus):
+    matrix, queries = corpus
+    q = queries[0] / np.linalg.norm(queries[0])
+    np.testing.assert_allclose(compact(matrix, "int8") @ q, matrix @ q, atol=0.02)
+
+
+def test_row_selection_and_dense_view(corpus):
+    matrix, _ = corpus
+    packed = CompactMatrix.from_dense(matrix, "int8")
+    rows = np.array([5, 1, 7])
+    np.testing.assert_allclose(np.asarray(packed[rows]), matrix[rows], atol=0.01)
+    assert compact(matrix, "float16", dims=16).shape == (3000, 16)
+    with pytest.raises(ValueError):
+        CompactMatrix.from_dense(matrix, "int4")
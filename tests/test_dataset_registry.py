@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from dataloader.dataset_registry import DatasetRegistry
+
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = DatasetRegistry(str(tmp_path))
+    registry.loads = []
+
+    def load(r):
+        registry.loads.append("poverty")
+        return {"df": pd.DataFrame({"District": ["Colombo", "Galle"], "line": [5000.0, 4200.0]})}
+
+    registry.register("poverty", load)
+    registry.register("model", lambda r: object(), reloadable=False)
+    return registry
+
+
+def test_loads_once_and_hands_out_isolated_views(registry):
+    # The serving entry points enable copy-on-write (app.py, ui/pages)
+    with pd.option_context("mode.copy_on_write", True):
+        view = registry.get("poverty")["df"]
+        view.loc[0, "line"] = 0.0
+        view["extra"] = 1
+        fresh = registry.get("poverty")["df"]
+    assert registry.loads == ["poverty"]
+    assert fresh.loc[0, "line"] == 5000.0
+    assert "extra" not in fresh.columns
+
+
+def test_reload_bumps_the_version_and_keeps_models(registry):
+    model = registry.get("model")
+    registry.get("poverty")
+    version = registry.version
+    registry.reload()
+    assert registry.version == version + 1
+    registry.get("poverty")
+    assert registry.loads == ["poverty", "poverty"]
+    assert registry.get("model") is model
+
+
+def test_unknown_dataset_raises(registry):
+    with pytest.raises(KeyError):
+        registry.get("missing")
@@ -0,0 +1,32 @@
+import pandas as pd
+
+from agents.domain_pipeline import DomainPipeline
+from agents.domain_plugins import MentalHealthDomain
+from dataloader.dataset_registry import get_registry
+from script.benchmark import HashingEncoder
+from signals.domain_signals import DomainQuerySignal
+
+
+def _pipeline(root, plugin):
+    registry = get_registry(str(root))
+    registry.register("model", lambda r: HashingEncoder(), replace=True, reloadable=False)
+    pipeline = DomainPipeline(str(root), registry=registry)
+    assert pipeline.register(plugin)
+    return pipeline, registry
+
+
+def test_mental_health_columns_follow_the_workbook_without_touching_the_plugin(tmp_path):
+    (tmp_path / "data").mkdir()
+    path = tmp_path / "data" / "mental_health.xlsx"
+    pd.DataFrame({"District": ["Colombo", "Kandy"], "admissions": [10, 20]}).to_excel(path, index=False)
+    plugin = MentalHealthDomain()
+    pipeline, registry = _pipeline(tmp_path, plugin)
+
+    result = pipeline.invoke(DomainQuerySignal(preference="admissions", k=2)).results["mental_health"]
+    assert set(result.metrics) == {"admissions"}
+
+    pd.DataFrame({"District": ["Colombo"], "clinics": [3]}).to_excel(path, index=False)
+    registry.reload()
+    result = pipeline.invoke(DomainQuerySignal(preference="clinics", k=1)).results["mental_health"]
+    assert set(result.metrics) == {"clinics"}
+    assert plugin.display_columns == [] and "display_columns" not in vars(plugin)
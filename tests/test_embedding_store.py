@@ -0,0 +1,28 @@
+import numpy as np
+
+from utils.embedding_store import EmbeddingStore
+
+
+def _encode(texts):
+    return np.array([[len(t), 1.0] for t in texts], dtype=np.float32)
+
+
+def test_rebuild_writes_a_new_matrix_file_and_keeps_old_mappings_valid(tmp_path):
+    store = EmbeddingStore(str(tmp_path), "model", "poverty")
+    old = store.get_or_encode(["a", "bb", "ccc"], _encode)
+    new = store.get_or_encode(["bb", "dddd"], _encode)
+
+    np.testing.assert_array_equal(old, _encode(["a", "bb", "ccc"]))
+    np.testing.assert_array_equal(new, _encode(["bb", "dddd"]))
+    # One matrix file per namespace after pruning, and it is the one the meta names
+    files = [p.name for p in (tmp_path / "model").glob("poverty.*.f32")]
+    assert files == [store._read_meta()["matrix"]]
+    assert store.holds(["bb", "dddd"])
+
+
+def test_reader_maps_the_matrix_named_by_the_meta(tmp_path):
+    store = EmbeddingStore(str(tmp_path), "model", "poverty")
+    store.get_or_encode(["a", "bb"], _encode)
+    meta = store._read_meta()
+    np.testing.assert_array_equal(store._map(meta), _encode(["a", "bb"]))
+    assert meta["matrix"] == (tmp_path / "model" / store.matrix_path(meta["keys"], meta["dim"])).name
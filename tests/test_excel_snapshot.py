@@ -0,0 +1,62 @@
+import os
+
+import pandas as pd
+import pytest
+
+from utils import excel_snapshot
+from utils.excel_snapshot import read_excel_cached
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / "book.xlsx"
+    pd.DataFrame({"District": ["Colombo", "Galle"], "2019": [5000, 4200], "2020": [5100, 4300]}).to_excel(
+        path, index=False
+    )
+    return str(path)
+
+
+@pytest.fixture
+def excel_reads(monkeypatch):
+    calls = []
+    read_excel = pd.read_excel
+
+    def spy(*args, **kwargs):
+        calls.append(kwargs)
+        return read_excel(*args, **kwargs)
+
+    monkeypatch.setattr(excel_snapshot.pd, "read_excel", spy)
+    return calls
+
+
+def test_second_read_is_served_from_the_snapshot(workbook, excel_reads):
+    first = read_excel_cached(workbook)
+    second = read_excel_cached(workbook)
+    assert len(excel_reads) == 1
+    pd.testing.assert_frame_equal(second, first)
+    pd.testing.assert_frame_equal(second, pd.read_excel(workbook))
+
+
+def test_mtime_only_change_rehashes_but_keeps_the_snapshot(workbook, excel_reads):
+    read_excel_cached(workbook)
+    st = os.stat(workbook)
+    os.utime(workbook, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    read_excel_cached(workbook)
+    assert len(excel_reads) == 1
+
+
+def test_changed_workbook_is_read_again(workbook, excel_reads):
+    read_excel_cached(workbook)
+    pd.DataFrame({"District": ["Kandy"], "2019": [3900]}).to_excel(workbook, index=False)
+    df = read_excel_cached(workbook)
+    assert len(excel_reads) == 2
+    assert df["District"].tolist() == ["Kandy"]
+
+
+def test_read_arguments_get_their_own_snapshot(workbook, excel_reads):
+    full = read_excel_cached(workbook)
+    narrow = read_excel_cached(workbook, usecols=["District", "2020"])
+    read_excel_cached(workbook, usecols=["District", "2020"])
+    assert len(excel_reads) == 2
+    assert list(narrow.columns) == ["District", "2020"]
+    pd.testing.assert_frame_equal(narrow, full[["District", "2020"]])
@@ -0,0 +1,46 @@
+import threading
+import time
+
+import pytest
+
+from service.execution_policy import ExecutionPolicy, Overloaded
+
+
+def _policy(queue_timeout_ms):
+    return ExecutionPolicy(workers=1, torch_threads=1, max_queue=1, queue_timeout_ms=queue_timeout_ms)
+
+
+@pytest.fixture
+def policy():
+    policy = _policy(50)
+    yield policy
+    policy.shutdown(wait=True)
+
+
+def test_sheds_requests_beyond_workers_plus_queue():
+    policy = _policy(10_000)
+    release = threading.Event()
+    running = policy.submit(release.wait)
+    queued = policy.submit(lambda: "queued")
+    with pytest.raises(Overloaded):
+        policy.submit(lambda: "shed")
+    release.set()
+    assert running.result() is True
+    assert queued.result() == "queued"
+    assert policy.stats()["rejected"] == 1
+    policy.shutdown(wait=True)
+
+
+def test_stale_requests_time_out_unrun(policy):
+    ran = []
+    blocker = policy.submit(time.sleep, 0.2)
+    late = policy.submit(ran.append, "late")
+    blocker.result()
+    with pytest.raises(Overloaded):
+        late.result()
+    assert ran == []
+    assert policy.stats()["timed_out"] == 1
+
+
+def test_run_from_a_worker_runs_inline(policy):
+    assert policy.run(lambda: policy.run(lambda: "nested")) == "nested"
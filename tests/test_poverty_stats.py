@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataloader.district_repository import poverty_stats
+
+
+@pytest.fixture
+def lines():
+    return pd.DataFrame(
+        {"2019": [100.0, np.nan, 50.0, np.nan], "2020": [110.0, 80.0, "_", np.nan], "2021": [121.0, 60.0, 40.0, np.nan]},
+        index=pd.Index(["A", "B", "C", "D"], name="District"),
+    )
+
+
+def test_first_latest_and_growth_skip_missing_periods(lines):
+    stats = poverty_stats(lines)
+    assert stats.loc["A", ["first", "latest", "change", "periods"]].tolist() == [100.0, 121.0, 21.0, 3]
+    assert stats.loc["B", "growth_rate"] == pytest.approx(-0.25)
+    assert stats.loc["C", ["first", "latest", "periods"]].tolist() == [50.0, 40.0, 2]
+    assert stats.loc["D"].isna()[["first", "latest", "rank"]].all()
+
+
+def test_rank_and_percentile_over_ranked_districts(lines):
+    stats = poverty_stats(lines)
+    assert stats["rank"].dropna().to_dict() == {"A": 1.0, "B": 2.0, "C": 3.0}
+    assert stats.loc["A", "percentile"] == 1.0
+    assert stats.loc["C", "percentile"] == pytest.approx(1 / 3)
+
+
+def test_bulk_insights_match_single_lookups(tmp_path):
+    pytest.importorskip("langchain_core")
+    from script.benchmark import generate_project
+    from agents.insight_generator_agent import InsightGeneratorAgent
+    from dataloader.dataset_registry import get_registry
+
+    generate_project(20, str(tmp_path))
+    agent = InsightGeneratorAgent(str(tmp_path), registry=get_registry(str(tmp_path)))
+    districts = list(agent.index)[:5] + ["Nowhere"]
+    bulk = agent.bulk(districts)
+    assert list(bulk) == districts
+    assert all(bulk[d] == agent.bulk([d])[d] for d in districts)
+    assert bulk["Nowhere"]["poverty"]["available"] is False
+    assert agent.compare(districts[:2]).index.tolist() == districts[:2]
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from script.benchmark import HashingEncoder, generate_project
+from dataloader.dataset_registry import get_registry
+from agents.nlp_recommendation_agent import NLPRecommendationAgent
+from service.query_cache import QueryCache
+from signals.nlp_signals import NLPQuerySignal
+
+
+@pytest.fixture(scope="module")
+def agent(tmp_path_factory):
+    root = str(tmp_path_factory.mktemp("project"))
+    generate_project(50, root)
+    registry = get_registry(root)
+    registry.register("model", lambda r: HashingEncoder(dim=32), replace=True, reloadable=False)
+    return NLPRecommendationAgent(root, registry=registry, query_cache=QueryCache())
+
+
+def test_all_structured_batch_skips_the_encoder(agent):
+    signals = [NLPQuerySignal(preference=p) for p in ("low poverty", "high population")]
+    results = agent.batch(signals)
+    assert [len(r) for r in results] == [10, 10]
+    for signal, result in zip(signals, results):
+        assert result.district.tolist() == agent.invoke(signal).district.tolist()
+
+
+def test_mixed_batch_matches_invoke(agent):
+    signals = [NLPQuerySignal(preference=p) for p in ("low poverty", "coastal districts")]
+    for signal, result in zip(signals, agent.batch(signals)):
+        assert result.district.tolist() == agent.invoke(signal).district.tolist()
+
+
+def test_query_cache_encodes_empty_input():
+    cache = QueryCache()
+    assert cache.encode("m", [], lambda batch: pytest.fail("encoder called")).shape == (0, 0)
+    cache.encode("m", ["coastal"], lambda batch: np.ones((len(batch), 4), dtype=np.float32))
+    assert cache.encode("m", [], lambda batch: pytest.fail("encoder called")).shape == (0, 4)
+
+
+def test_result_key_covers_index_options(agent):
+    other = NLPRecommendationAgent(agent.loader.project_root, registry=agent.loader.registry, precision="int8")
+    assert other.data_key == agent.data_key
+    assert other.result_key != agent.result_key
+
+
+def test_query_cache_keeps_results_of_other_keys():
+    cache = QueryCache()
+    cache.put_result("Coastal ", 10, "v1", "old")
+    cache.put_result("coastal", 10, "v2", "new")
+    assert cache.get_result("coastal", 10, "v1") == "old"
+    assert cache.get_result("coastal", 10, "v2") == "new"
+
+
+def test_filter_only_preference_is_ranked_by_the_filtered_column(agent):
+    for preference, descending in (("population over 1000", True), ("population under 100000000", False)):
+        result = agent.invoke(NLPQuerySignal(preference=preference))
+        population = agent.df["Population"].to_numpy()[result.rows]
+        assert len(result) == 10 and not np.isnan(result.score).any()
+        assert list(population) == sorted(population, reverse=descending)
+
+
+def test_query_cache_normalizes_the_key_but_encodes_the_original_text():
+    cache = QueryCache()
+    seen = []
+
+    def encode(batch):
+        seen.extend(batch)
+        return np.ones((len(batch), 4), dtype=np.float32)
+
+    cache.encode("m", ["Coastal Areas", "coastal  areas"], encode)
+    cache.encode("m", ["COASTAL areas"], encode)
+    assert seen == ["Coastal Areas"]
@@ -0,0 +1,44 @@
+import numpy as np
+
+from utils.similarity_search import IVFBackend, SimilarityIndex, normalize_rows, top_k
+
+
+def _corpus(n=2000, d=16, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((20, d))
+    matrix = centers[rng.integers(0, 20, n)] + 0.3 * rng.standard_normal((n, d))
+    return normalize_rows(matrix.astype(np.float32)), rng
+
+
+def test_top_k_matches_a_full_sort():
+    scores = np.random.default_rng(1).standard_normal(1000)
+    for k in (1, 10, 999, 1000, 5000):
+        np.testing.assert_array_equal(top_k(scores, k), np.argsort(-scores)[:k])
+    assert len(top_k(scores, 0)) == 0
+
+
+def test_exact_search_returns_the_best_rows_in_order():
+    matrix, rng = _corpus()
+    q = rng.standard_normal(16)
+    rows, scores = SimilarityIndex(matrix).search(q, k=10)
+    expected = matrix @ (q / np.linalg.norm(q))
+    np.testing.assert_array_equal(rows, np.argsort(-expected)[:10])
+    np.testing.assert_allclose(scores, expected[rows], rtol=1e-5)
+
+
+def test_ivf_recall_on_clustered_data():
+    matrix, rng = _corpus()
+    exact = SimilarityIndex(matrix, backend="exact")
+    ivf = SimilarityIndex(matrix, backend="ivf")
+    queries = matrix[rng.integers(0, len(matrix), 50)] + 0.1 * rng.standard_normal((50, 16))
+    recall = np.mean([
+        len(set(exact.search(q, 10)[0]) & set(ivf.search(q, 10)[0])) / 10 for q in queries
+    ])
+    assert recall >= 0.9
+
+
+def test_auto_uses_ivf_only_above_an_explicit_threshold():
+    matrix, _ = _corpus(n=500)
+    assert not isinstance(SimilarityIndex(matrix).backend, IVFBackend)
+    assert not isinstance(SimilarityIndex(matrix, approx_threshold=500).backend, IVFBackend)
+    assert isinstance(SimilarityIndex(matrix, approx_threshold=499).backend, IVFBackend)
@@ -0,0 +1,22 @@
+from agents.structured_preferences import parse_preference
+
+
+def test_negated_term_flips_direction():
+    pref = parse_preference("not high poverty")
+    assert pref.terms == [("average_poverty_line", -1)]
+    assert pref.residual == ""
+
+
+def test_negated_filter_inverts_operator():
+    assert parse_preference("without population over 1m").filters == [("Population", "<=", 1e6)]
+
+
+def test_negation_only_applies_to_the_following_phrase():
+    pref = parse_preference("avoid high poverty and high population")
+    assert pref.terms == [("average_poverty_line", -1), ("Population", 1)]
+
+
+def test_residual_keeps_the_original_casing():
+    pref = parse_preference("Low poverty near Colombo")
+    assert pref.terms == [("average_poverty_line", -1)]
+    assert pref.residual == "near Colombo"
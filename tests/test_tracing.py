@@ -0,0 +1,43 @@
+import threading
+
+from service.execution_policy import ExecutionPolicy
+from utils import tracing
+
+
+def _traced(name, work):
+    tracing.enable_in_context(True)
+    try:
+        with tracing.trace(name):
+            work()
+    finally:
+        tracing.enable_in_context(False)
+    return tracing.last_trace()
+
+
+def test_spans_on_pool_threads_nest_under_the_submitting_span():
+    policy = ExecutionPolicy(workers=1, torch_threads=1, max_queue=1, queue_timeout_ms=10_000)
+
+    def encode():
+        with tracing.span("pooled"):
+            pass
+
+    def work():
+        with tracing.span("outer"):
+            policy.submit(encode).result()
+
+    try:
+        record = _traced("request", work)
+    finally:
+        policy.shutdown(wait=True)
+    depths = {s["name"]: s["depth"] for s in record["spans"]}
+    assert depths == {"request": 0, "outer": 1, "pooled": 2}
+
+
+def test_last_trace_is_not_shared_between_threads():
+    _traced("mine", lambda: None)
+    seen = []
+    other = threading.Thread(target=lambda: seen.append(tracing.last_trace()))
+    other.start()
+    other.join()
+    assert tracing.last_trace()["trace"] == "mine"
+    assert seen == [None]
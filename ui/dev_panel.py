@@ -0,0 +1,26 @@
+import pandas as pd
+import streamlit as st
+
+from utils import tracing
+
+
+def trace_panel():
+    """Sidebar developer toggle; call the returned function at the end of the page to show the timings."""
+    # Scoped to this session's script run: other sessions stay untraced unless DSGP_TRACING=1
+    on = st.sidebar.toggle("Developer: stage timings", value=tracing.enabled())
+    tracing.enable_in_context(on)
+    slot = st.sidebar.empty()
+
+    def show():
+        record = tracing.last_trace() if on else None
+        if record is None:
+            return
+        with slot.container():
+            st.caption(f"Last request: {record['trace']} — {record['total_ms']:.1f} ms")
+            spans = pd.DataFrame([
+                {"stage": "  " * s["depth"] + s["name"], "start_ms": s["offset_ms"], "ms": s["ms"]}
+                for s in record["spans"]
+            ])
+            st.dataframe(spans.round(2), use_container_width=True, hide_index=True)
+
+    return show
@@ -10,7 +10,13 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 # Now Python can find the 'service' folder in the PROJECT_ROOT
+from service.execution_policy import Overloaded
 from service.recommendation_service import RecommendationService
+from ui.dev_panel import trace_panel
+from service.child_protection_service import ChildProtectionService
+
+# Each page is its own entry point; copy-on-write guards the registry's shared frames (see app.py)
+pd.set_option("mode.copy_on_write", True)
 
 st.set_page_config(
     page_title="Region Recommendation System",
@@ -20,18 +26,21 @@ st.set_page_config(
 # Use caching to prevent the slow model from reloading on every interaction
 @st.cache_resource
 def load_service():
-    return RecommendationService()
-
-@st.cache_data(show_spinner=False)
-def get_cached_recommendations(text):
-    return service.get_recommendations(text)
+    service = RecommendationService()
+    # Load the model in the background so the page paints before it is ready
+    service.warmup(background=True, insights=False)
+    return service
 
+@st.cache_resource
+def load_child_service():
+    return ChildProtectionService()
 
 st.title("📍 Intelligent Region Recommendation System")
 st.write("Enter your preferences to get top 10 recommended regions")
 
 # Initialize the service once
 service = load_service()
+show_trace = trace_panel()
 
 user_input = st.text_input(
     "Describe your preference (e.g. low poverty, high population, urban areas):"
@@ -41,13 +50,28 @@ if st.button("Get Recommendations"):
     if user_input.strip() == "":
         st.warning("Please enter a preference.")
     else:
-        with st.spinner("Analyzing preferences..."):
-            result = service.get_recommendations(user_input)
+        try:
+            with st.spinner("Analyzing preferences..."):
+                result = service.get_recommendations(user_input)
+        except Overloaded:
+            st.warning("The recommender is busy right now, please try again in a moment.")
+            st.stop()
 
-        df = result["recommendations"]
+        recs = result["recommendations"]
 
         st.success("Top 10 Recommended Regions")
         st.dataframe(
-            df,
+            recs.to_frame(),
             use_container_width=True
-        )
\ No newline at end of file
+        )
+
+        # Reported NCPA cases for the recommended districts (streamed once from childcases.xlsx)
+        districts = recs.district.tolist()
+        if districts:
+            st.subheader("Reported Child Protection Cases")
+            st.dataframe(
+                load_child_service().get_summary(districts),
+                use_container_width=True
+            )
+
+show_trace()
@@ -1,23 +1,46 @@
 import sys
 import os
+from collections.abc import Mapping
 import streamlit as st
 import pandas as pd
 
-import plotly.express as px
+import plotly.graph_objects as go
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
+from service.execution_policy import Overloaded
 from service.recommendation_service import RecommendationService
+from ui.dev_panel import trace_panel
+from utils.payloads import unfreeze
+
+# Each page is its own entry point; copy-on-write guards the registry's shared frames (see app.py)
+pd.set_option("mode.copy_on_write", True)
 
 st.set_page_config(page_title="Region Recommendation Dashboard", layout="wide")
 
 @st.cache_resource
 def load_service():
-    return RecommendationService()
+    service = RecommendationService()
+    # Load the model in the background so the page paints before it is ready
+    service.warmup(background=True)
+    return service
 
 service = load_service()
+show_trace = trace_panel()
+
+
+# Keyed by the version of the snapshot the payload came from (not hashed: _insights)
+@st.cache_data(max_entries=256)
+def trend_table(district: str, data_version: int, _insights) -> pd.DataFrame:
+    series = _insights["poverty"].get("series") or {}
+    smoothed = series.get("smoothed", {})
+    table = pd.DataFrame({series.get("axis", "Period"): list(series.get("x", ()))})
+    for window, values in smoothed.items():
+        table["Poverty Line" if window == 1 else f"Smoothed ({window})"] = list(values)
+    return table
+
 
 st.title(" Intelligent Region Recommendation Dashboard")
 st.caption("NLP recommendations + interactive poverty line insights (poverty + demographics only)")
@@ -40,25 +63,43 @@ if run_btn:
     if user_input.strip() == "":
         st.warning("Please enter a preference.")
     else:
-        with st.spinner("Analyzing preferences..."):
-            result = service.get_recommendations(user_input)
-        st.session_state.recommendations = result.get("recommendations", [])
+        try:
+            with st.spinner("Analyzing preferences..."):
+                result = service.get_recommendations(user_input)
+        except Overloaded:
+            # Shed by the shared encoder queue: every session is waiting on the same workers
+            st.warning("The recommender is busy right now, please try again in a moment.")
+            st.stop()
+        st.session_state.recommendations = result["recommendations"]
 
 # ---------------------------
 # Recommendations Table
 # ---------------------------
 recs = st.session_state.recommendations
-if recs:
-    rec_df = pd.DataFrame(recs)
-
+if recs is not None:
     st.subheader(" Top Recommended Regions")
-    st.dataframe(rec_df, use_container_width=True, height=280)
+    # Columnar result: the table is built from its arrays, no dict per row
+    st.dataframe(recs.to_frame(), use_container_width=True, height=280)
 
-    districts = [r["District"] for r in recs if isinstance(r, dict) and "District" in r]
+    districts = recs.district.tolist()
     if not districts:
-        st.error("No District names found in recommendations output.")
+        st.error("No districts matched this preference.")
         st.stop()
 
+    # ---------------------------
+    # Side-by-side comparison of every recommended region (one bulk call)
+    # ---------------------------
+    with st.expander("Compare recommended regions", expanded=False):
+        compare_df = service.get_district_comparison(districts)
+        compare_df = compare_df.rename(columns={
+            "first": "First", "latest": "Latest", "change": "Change (first → last)",
+            "growth_rate": "Growth", "periods": "Periods", "rank": "Rank", "percentile": "Percentile",
+        })
+        st.dataframe(
+            compare_df.style.format({"Growth": "{:.2%}", "Percentile": "{:.0%}"}, na_rep="N/A"),
+            use_container_width=True,
+        )
+
     st.divider()
 
     # ---------------------------
@@ -78,8 +119,9 @@ if recs:
         rolling_window = st.selectbox("Smoothing (rolling mean)", [1, 3, 5, 7], index=0)
 
     # Generate insights ONLY after a region is selected
+    # Version and payload come from one snapshot, so a concurrent reload can't pair them wrongly
     with st.spinner("Generating insights..."):
-        insights = service.get_insights(selected_district)
+        data_version, insights = service.get_insights_snapshot(selected_district)
 
     poverty = insights.get("poverty", {})
     demo = insights.get("demographics", {})
@@ -92,15 +134,8 @@ if recs:
     latest = poverty.get("latest", None)
     trend_dict = poverty.get("trend", {}) or {}
 
-    # compute change if possible
-    change = None
-    if isinstance(trend_dict, dict) and len(trend_dict) >= 2:
-        try:
-            vals = [float(v) for v in trend_dict.values() if v is not None]
-            if len(vals) >= 2:
-                change = vals[-1] - vals[0]
-        except Exception:
-            change = None
+    # first → last change is precomputed with the insight payload
+    change = poverty.get("change", None)
 
     k1.metric("Selected Region", selected_district)
     k2.metric("Latest Poverty Line", "N/A" if latest is None else f"{latest:,.2f}")
@@ -108,88 +143,59 @@ if recs:
     k4.metric("Change (first → last)", "N/A" if change is None else f"{change:,.2f}")
 
     # ---------------------------
-    # Build Poverty Chart DataFrame
+    # Poverty Chart (series are chronological, numeric and pre-smoothed in the payload)
     # ---------------------------
+    series = poverty.get("series") or {}
     if not trend_dict:
         st.info("No poverty trend data available for this district.")
+    elif not series.get("x"):
+        st.info("Poverty trend values are not numeric or are missing.")
     else:
-        chart_df = pd.DataFrame(
-            {"Period": list(trend_dict.keys()), "PovertyLine": list(trend_dict.values())}
+        axis = series["axis"]
+        y_name = "Poverty Line" if rolling_window == 1 else f"Poverty Line (smoothed, window={rolling_window})"
+
+        # Reruns only restyle: no frame building, parsing or rolling means here
+        fig = go.Figure(go.Scatter(
+            x=series["x"],
+            y=series["smoothed"][rolling_window],
+            mode="lines+markers" if show_points else "lines",
+            name=y_name,
+        ))
+        fig.update_layout(
+            title=f"Poverty Line Trend — {selected_district}",
+            xaxis_title=axis,
+            yaxis_title=y_name,
+            height=420,
+            margin=dict(l=20, r=20, t=60, b=20),
+            hovermode="x unified",
         )
 
-        # Try to sort Period intelligently (year-like), otherwise keep order
-        def _to_year(x):
-            try:
-                # handles "2019" or 2019
-                return int(str(x).strip()[:4])
-            except Exception:
-                return None
-
-        years = chart_df["Period"].apply(_to_year)
-        if years.notna().all():
-            chart_df["Year"] = years
-            chart_df = chart_df.sort_values("Year")
-            x_col = "Year"
-        else:
-            # fallback: keep as string order
-            chart_df["Period"] = chart_df["Period"].astype(str)
-            x_col = "Period"
-
-        # Numeric
-        chart_df["PovertyLine"] = pd.to_numeric(chart_df["PovertyLine"], errors="coerce")
-        chart_df = chart_df.dropna(subset=["PovertyLine"])
-
-        if chart_df.empty:
-            st.info("Poverty trend values are not numeric or are missing.")
-        else:
-            # Optional smoothing
-            if rolling_window > 1:
-                chart_df["Smoothed"] = chart_df["PovertyLine"].rolling(rolling_window, min_periods=1).mean()
-                y_col = "Smoothed"
-                y_name = f"Poverty Line (smoothed, window={rolling_window})"
-            else:
-                y_col = "PovertyLine"
-                y_name = "Poverty Line"
-
-            # Plotly interactive line chart
-            fig = px.line(
-                chart_df,
-                x=x_col,
-                y=y_col,
-                markers=show_points,
-                title=f"Poverty Line Trend — {selected_district}",
-                labels={x_col: "Year" if x_col == "Year" else "Period", y_col: y_name},
-            )
-
-            fig.update_layout(
-                height=420,
-                margin=dict(l=20, r=20, t=60, b=20),
-                hovermode="x unified",
-            )
-
-            if use_log_y:
-                fig.update_yaxes(type="log")
-
-            if show_rangeslider:
-                fig.update_xaxes(rangeslider=dict(visible=True))
-
-            with right:
-                st.plotly_chart(fig, use_container_width=True)
-
-            # Optional: show raw table under chart
-            with st.expander("Show poverty trend data"):
-                st.dataframe(chart_df, use_container_width=True)
+        if use_log_y:
+            fig.update_yaxes(type="log")
+
+        if show_rangeslider:
+            fig.update_xaxes(rangeslider=dict(visible=True))
+
+        with right:
+            st.plotly_chart(fig, use_container_width=True)
+
+        # Optional: show raw table under chart
+        with st.expander("Show poverty trend data"):
+            st.dataframe(trend_table(selected_district, data_version, insights), use_container_width=True)
 
     # ---------------------------
     # Demographics Panel
     # ---------------------------
     st.markdown("### Demographics Snapshot")
-    if isinstance(demo, dict) and demo:
+    if isinstance(demo, Mapping) and demo:
         # If your demographics has huge columns, you can filter here
-        demo_df = pd.DataFrame([demo])
+        # Payloads are read-only mappings; Arrow only converts plain dicts (the "row" cell is one)
+        demo_df = pd.DataFrame([unfreeze(demo)])
         st.dataframe(demo_df, use_container_width=True)
     else:
         st.info("No demographic data available for this district.")
 
 else:
     st.info("Enter a preference and click **Get Recommendations** to begin.")
+
+show_trace()
@@ -0,0 +1,71 @@
+import numpy as np
+
+PRECISIONS = ("float32", "float16", "int8")
+_CHUNK = 16384
+
+
+class CompactMatrix:
+    """Row-major embedding matrix stored as float16, or as int8 codes with a per-row float32 scale.
+
+    Supports the operations the search backends need (len, row selection, ``matrix @ q``)
+    and scores in fixed-size row chunks, so no full float32 copy is ever materialized.
+    """
+
+    def __init__(self, data: np.ndarray, scale=None):
+        self.data = data
+        self.scale = scale
+
+    @classmethod
+    def from_dense(cls, matrix: np.ndarray, precision: str):
+        if precision == "float16":
+            return cls(np.asarray(matrix, dtype=np.float16))
+        if precision == "int8":
+            matrix = np.asarray(matrix, dtype=np.float32)
+            scale = np.abs(matrix).max(axis=1) / 127.0
+            scale[scale == 0] = 1.0
+            codes = np.round(matrix / scale[:, None]).astype(np.int8)
+            return cls(codes, scale.astype(np.float32))
+        raise ValueError(f"Unsupported precision '{precision}', expected one of {PRECISIONS}")
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + (self.scale.nbytes if self.scale is not None else 0)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, rows):
+        return CompactMatrix(self.data[rows], None if self.scale is None else self.scale[rows])
+
+    def __array__(self, dtype=None, copy=None):
+        dense = self.data.astype(np.float32)
+        if self.scale is not None:
+            dense *= self.scale[:, None]
+        return dense if dtype is None else dense.astype(dtype)
+
+    def __matmul__(self, q: np.ndarray) -> np.ndarray:
+        q = np.asarray(q, dtype=np.float32)
+        out = np.empty((len(self.data),) + q.shape[1:], dtype=np.float32)
+        for start in range(0, len(self.data), _CHUNK):
+            stop = start + _CHUNK
+            scores = self.data[start:stop].astype(np.float32) @ q
+            if self.scale is not None:
+                scores *= self.scale[start:stop].reshape((-1,) + (1,) * (q.ndim - 1))
+            out[start:stop] = scores
+        return out
+
+
+def compact(matrix: np.ndarray, precision: str = "float32", dims=None):
+    """Optionally truncate to the first dims components, then store at the requested precision.
+
+    Truncated rows are not re-normalized here; callers normalize after truncation.
+    """
+    if dims is not None:
+        matrix = matrix[:, :dims]
+    if precision == "float32":
+        return matrix
+    return CompactMatrix.from_dense(matrix, precision)
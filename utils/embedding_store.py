@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process dev setups only
+    fcntl = None
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def model_identity(model) -> str:
+    """Stable id for an encoder: architecture plus a cheap fingerprint of its weights."""
+    h = hashlib.sha1(repr(model).encode("utf-8"))
+    params = getattr(model, "parameters", None)
+    if params is not None:
+        for p in params():
+            h.update(np.float64(p.detach().float().sum().item()).tobytes())
+    return h.hexdigest()[:16]
+
+
+@contextmanager
+def file_lock(path):
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class EmbeddingStore:
+    """Float32 embedding matrix persisted as a raw file and served through np.memmap.
+
+    Rows are keyed by the sha1 of their text under a directory named after the model identity,
+    so a different encoder never reuses stale vectors. The file is kept in the caller's row order,
+    which lets every worker map the same file and share its pages through the OS page cache.
+
+    Each matrix file is named after its contents and never rewritten; the meta file names the
+    current one. Replacing the meta is the only switch, so a reader without the lock always maps
+    the matrix that matches the keys it read.
+    """
+
+    def __init__(self, root: str, model_id: str, namespace: str):
+        self.dir = os.path.join(root, model_id)
+        self.namespace = namespace
+        self.meta_path = os.path.join(self.dir, f"{namespace}.json")
+        self.lock_path = os.path.join(self.dir, f"{namespace}.lock")
+
+    def matrix_path(self, keys, dim: int) -> str:
+        digest = text_key(json.dumps([dim, keys]))[:16]
+        return os.path.join(self.dir, f"{self.namespace}.{digest}.f32")
+
+    def write_meta(self, keys, dim: int):
+        """Point the store at the matrix file for keys (written beforehand) in one atomic replace."""
+        tmp = f"{self.meta_path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"dim": dim, "keys": keys, "matrix": os.path.basename(self.matrix_path(keys, dim))}, f)
+        os.replace(tmp, self.meta_path)
+
+    def _read_meta(self):
+        try:
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        # Stores written before content-keyed names have no "matrix" entry: rebuild them
+        return meta if "matrix" in meta else None
+
+    def _map(self, meta):
+        # Copy-on-write mapping: pages stay shared between processes unless someone writes to them
+        path = os.path.join(self.dir, meta["matrix"])
+        return np.memmap(path, dtype=np.float32, mode="c", shape=(len(meta["keys"]), meta["dim"]))
+
+    def _prune(self, keep: str):
+        # Workers that already mapped an older file keep their pages until they remap
+        prefix = f"{self.namespace}."
+        for name in os.listdir(self.dir):
+            if name.startswith(prefix) and name.endswith(".f32") and name != keep:
+                try:
+                    os.remove(os.path.join(self.dir, name))
+                except FileNotFoundError:
+                    pass
+
+    def holds(self, texts) -> bool:
+        """True if the stored matrix is exactly these texts, in this order."""
+        meta = self._read_meta()
+        return meta is not None and meta["keys"] == [text_key(t) for t in texts]
+
+    def get_or_encode(self, texts, encode_fn) -> np.ndarray:
+        """Return a (len(texts), dim) matrix, calling encode_fn only for texts not stored yet."""
+        keys = [text_key(t) for t in texts]
+        if not keys:
+            return np.empty((0, 0), dtype=np.float32)
+        meta = self._read_meta()
+        if meta is not None and meta["keys"] == keys:
+            try:
+                return self._map(meta)
+            except FileNotFoundError:
+                # Pruned by a writer between our meta read and the mapping: retry under the lock
+                pass
+
+        os.makedirs(self.dir, exist_ok=True)
+        with file_lock(self.lock_path):
+            # Another worker may have rebuilt the file while we waited for the lock
+            meta = self._read_meta()
+            if meta is not None and meta["keys"] == keys:
+                return self._map(meta)
+
+            old = self._map(meta) if meta is not None else None
+            old_rows = {k: i for i, k in enumerate(meta["keys"])} if meta is not None else {}
+
+            missing = [i for i, k in enumerate(keys) if k not in old_rows]
+            fresh = np.asarray(encode_fn([texts[i] for i in missing]), dtype=np.float32) if missing else None
+
+            dim = fresh.shape[1] if fresh is not None else meta["dim"]
+            out = np.empty((len(keys), dim), dtype=np.float32)
+            hit = [i for i, k in enumerate(keys) if k in old_rows]
+            if hit:
+                out[hit] = old[[old_rows[keys[i]] for i in hit]]
+            if missing:
+                out[missing] = fresh
+
+            path = self.matrix_path(keys, dim)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            out.tofile(tmp)
+            os.replace(tmp, path)
+            self.write_meta(keys, dim)
+            self._prune(os.path.basename(path))
+
+            return self._map(self._read_meta())
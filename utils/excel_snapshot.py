@@ -0,0 +1,79 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+SNAPSHOT_DIR_NAME = ".snapshots"
+
+
+def file_hash(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _snapshot_key(path, read_kwargs):
+    # Same workbook read with different arguments (sheet, usecols, ...) gets its own snapshot
+    raw = json.dumps([os.path.abspath(path), sorted(read_kwargs.items())], default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _write_atomic(write, target):
+    tmp = f"{target}.{os.getpid()}.tmp"
+    write(tmp)
+    os.replace(tmp, target)
+
+
+def _write_json(data, path):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def read_excel_cached(path, snapshot_dir=None, **read_kwargs):
+    """pd.read_excel backed by a Parquet snapshot that is rebuilt only when the workbook changes.
+
+    The snapshot is keyed by the source path and read arguments and validated against the
+    workbook's size, mtime and sha256. A size/mtime match skips hashing entirely; an mtime-only
+    change (e.g. a fresh checkout) re-hashes and keeps the snapshot if the content is the same.
+    """
+    snapshot_dir = snapshot_dir or os.path.join(os.path.dirname(os.path.abspath(path)), SNAPSHOT_DIR_NAME)
+    key = _snapshot_key(path, read_kwargs)
+    base = os.path.join(snapshot_dir, f"{os.path.splitext(os.path.basename(path))[0]}-{key}")
+    parquet_path, manifest_path = base + ".parquet", base + ".json"
+
+    st = os.stat(path)
+    manifest = {}
+    if os.path.exists(manifest_path) and os.path.exists(parquet_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    if manifest.get("size") == st.st_size and manifest.get("mtime_ns") == st.st_mtime_ns:
+        return pd.read_parquet(parquet_path)
+
+    digest = file_hash(path)
+    if manifest.get("sha256") == digest:
+        df = pd.read_parquet(parquet_path)
+    else:
+        df = pd.read_excel(path, **read_kwargs)
+        try:
+            os.makedirs(snapshot_dir, exist_ok=True)
+            _write_atomic(lambda p: df.to_parquet(p), parquet_path)
+        except (ImportError, ValueError, TypeError, OSError):
+            # No pyarrow, non-string column labels or a read-only data dir: serve straight from Excel
+            return df
+
+    manifest = {
+        "source": os.path.abspath(path),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": digest,
+        "read_kwargs": {k: repr(v) for k, v in read_kwargs.items()},
+    }
+    try:
+        _write_atomic(lambda p: _write_json(manifest, p), manifest_path)
+    except OSError:
+        pass
+    return df
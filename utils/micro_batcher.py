@@ -0,0 +1,53 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """Groups single requests that arrive close together into one call of batch_fn.
+
+    The worker takes the first waiting request, drains whatever else is already queued
+    (requests that piled up during the previous forward pass), and then waits at most
+    max_wait_ms for stragglers. An idle service therefore pays at most max_wait_ms per request.
+    """
+
+    def __init__(self, batch_fn, max_batch: int = 32, max_wait_ms: float = 2.0):
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, item) -> Future:
+        fut = Future()
+        self._queue.put((item, fut))
+        return fut
+
+    def __call__(self, item, timeout=None):
+        return self.submit(item).result(timeout)
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+            try:
+                results = self.batch_fn(items)
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            for (_, fut), result in zip(batch, results):
+                fut.set_result(result)
@@ -0,0 +1,35 @@
+from types import MappingProxyType
+
+import numpy as np
+
+
+def freeze(value):
+    """Read-only version of a nested dict payload that is shared between callers."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    return value
+
+
+def unfreeze(value):
+    """Mutable deep copy of a frozen payload; unlike thaw() it keeps keys and value types."""
+    if isinstance(value, (dict, MappingProxyType)):
+        return {k: unfreeze(v) for k, v in value.items()}
+    return value
+
+
+def thaw(value):
+    """Plain, JSON-serializable copy of a payload: dicts, lists and Python scalars only."""
+    if isinstance(value, (dict, MappingProxyType)):
+        return {str(k): thaw(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if hasattr(value, "to_columns"):
+        # Columnar results (signals.nlp_signals.RecommendationSignal) stay columnar
+        return thaw(value.to_columns())
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
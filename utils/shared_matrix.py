@@ -0,0 +1,91 @@
+import mmap
+import os
+import tempfile
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from utils.compact_embeddings import CompactMatrix
+from utils.embedding_store import file_lock
+
+# Open segments must stay referenced for as long as arrays view their buffers
+_segments = {}
+# Segments this process created; only the creator unlinks, the other workers just detach
+_owned = set()
+
+
+def _untrack(shm: SharedMemory):
+    # Before Python 3.13 every process that merely attaches registers the segment with its
+    # resource tracker, which unlinks it on exit and pulls it out from under the other workers.
+    try:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+
+
+def shared_matrix(name: str, matrix: np.ndarray) -> np.ndarray:
+    """Return a read-only copy of matrix that lives in the named shared-memory segment.
+
+    The first process to ask for a name creates the segment and copies matrix in; every later
+    process (e.g. the other uvicorn workers) attaches to the same physical pages. Names should
+    include a content key so changed data gets a new segment; release(name, unlink=True) removes
+    a generation that is no longer served (in the creating process; elsewhere it only detaches).
+    """
+    shm_name = f"dsgp_{name}"
+    if shm_name not in _segments:
+        with file_lock(os.path.join(tempfile.gettempdir(), f"{shm_name}.lock")):
+            try:
+                shm = SharedMemory(name=shm_name)
+                if shm.size < matrix.nbytes:
+                    raise ValueError(f"Shared segment {shm_name} is smaller than the matrix")
+            except FileNotFoundError:
+                shm = SharedMemory(name=shm_name, create=True, size=max(matrix.nbytes, 1))
+                np.ndarray(matrix.shape, dtype=matrix.dtype, buffer=shm.buf)[:] = matrix
+                _owned.add(shm_name)
+        _untrack(shm)
+        _segments[shm_name] = shm
+
+    arr = np.ndarray(matrix.shape, dtype=matrix.dtype, buffer=_segments[shm_name].buf)
+    arr.flags.writeable = False
+    return arr
+
+
+def file_backed(matrix) -> bool:
+    """True if matrix views a memory-mapped file, whose pages processes already share."""
+    while matrix is not None:
+        if isinstance(matrix, (np.memmap, mmap.mmap)):
+            return True
+        matrix = getattr(matrix, "base", None)
+    return False
+
+
+def shared_index_matrix(name: str, matrix):
+    """shared_matrix() for what a SimilarityIndex stores: a dense array or a CompactMatrix."""
+    if isinstance(matrix, CompactMatrix):
+        scale = None if matrix.scale is None else shared_matrix(f"{name}_scale", matrix.scale)
+        return CompactMatrix(shared_matrix(f"{name}_codes", matrix.data), scale)
+    return shared_matrix(name, np.asarray(matrix))
+
+
+def release(name: str, unlink: bool = False):
+    """Detach from a segment (and its CompactMatrix parts).
+
+    unlink also removes the name if this process created the segment. Workers that attached to it
+    only detach, so one worker shutting down never takes the segment from the others.
+    """
+    for part in (name, f"{name}_codes", f"{name}_scale"):
+        shm_name = f"dsgp_{part}"
+        shm = _segments.pop(shm_name, None)
+        if shm is None:
+            continue
+        shm.close()
+        if unlink and shm_name in _owned:
+            _owned.discard(shm_name)
+            # unlink() unregisters from the tracker again; put back the entry _untrack removed
+            resource_tracker.register(shm._name, "shared_memory")
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                # Another worker already unlinked this generation
+                resource_tracker.unregister(shm._name, "shared_memory")
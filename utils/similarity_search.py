@@ -0,0 +1,165 @@
+import numpy as np
+
+from utils.compact_embeddings import compact
+from utils.shared_matrix import file_backed, shared_index_matrix
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    if np.allclose(norms, 1.0, atol=1e-4):
+        # Already unit length (e.g. stored normalized): keep the memmap instead of copying it
+        return matrix
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, best first, in O(n + k log k)."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < len(scores):
+        part = np.argpartition(scores, -k)[-k:]
+    else:
+        part = np.arange(len(scores))
+    return part[np.argsort(scores[part])[::-1]]
+
+
+class ExactBackend:
+    """Brute-force inner product over every row."""
+
+    def __init__(self, matrix: np.ndarray):
+        self.matrix = matrix
+
+    def search(self, q: np.ndarray, k: int, mask=None):
+        if mask is not None:
+            rows = np.flatnonzero(mask)
+            scores = self.matrix[rows] @ q
+            sel = top_k(scores, k)
+            return rows[sel], scores[sel]
+        scores = self.matrix @ q
+        sel = top_k(scores, k)
+        return sel, scores[sel]
+
+    def search_many(self, Q: np.ndarray, k: int, masks):
+        # One (n_rows, n_queries) matmul for the whole batch, then per-query selection
+        all_scores = (self.matrix @ Q.T).T
+        results = []
+        for scores, mask in zip(all_scores, masks):
+            if mask is not None:
+                rows = np.flatnonzero(mask)
+                sel = top_k(scores[rows], k)
+                results.append((rows[sel], scores[rows][sel]))
+            else:
+                sel = top_k(scores, k)
+                results.append((sel, scores[sel]))
+        return results
+
+
+class IVFBackend:
+    """Inverted-file index: spherical k-means lists, only the n_probe closest lists are scanned.
+
+    Approximate: recall depends on how clustered the corpus is. On 60k synthetic rows with the
+    default n_probe (n_lists // 8) recall@10 was ~0.97 for clustered vectors but only ~0.57 for
+    unstructured Gaussian ones (0.79 at n_lists // 4, 0.94 at n_lists // 2, where it is no longer
+    faster than the exact scan). Measure on your own corpus before enabling it.
+    """
+
+    def __init__(self, matrix: np.ndarray, n_lists=None, n_probe=None, n_iter=10, seed=0):
+        n = len(matrix)
+        self.matrix = matrix
+        self.n_lists = n_lists or max(1, int(np.sqrt(n)))
+        self.n_probe = n_probe or max(1, self.n_lists // 8)
+
+        rng = np.random.default_rng(seed)
+        sample = np.asarray(matrix[np.sort(rng.choice(n, size=min(n, self.n_lists * 64), replace=False))])
+        centroids = sample[rng.choice(len(sample), self.n_lists, replace=False)].copy()
+        for _ in range(n_iter):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            empty = ~sums.any(axis=1)
+            sums[empty] = centroids[empty]
+            centroids = normalize_rows(sums)
+        self.centroids = centroids
+
+        assign = np.empty(n, dtype=np.int64)
+        for start in range(0, n, 65536):
+            assign[start:start + 65536] = np.argmax(matrix[start:start + 65536] @ centroids.T, axis=1)
+        self.order = np.argsort(assign, kind="stable")
+        self.offsets = np.searchsorted(assign[self.order], np.arange(self.n_lists + 1))
+
+    def search(self, q: np.ndarray, k: int, mask=None):
+        probe = top_k(self.centroids @ q, self.n_probe)
+        cand = np.concatenate([self.order[self.offsets[c]:self.offsets[c + 1]] for c in probe])
+        if mask is not None:
+            cand = cand[mask[cand]]
+            if len(cand) < k:
+                # A tight filter can empty the probed lists; the masked subset is small, scan it exactly
+                return ExactBackend(self.matrix).search(q, k, mask)
+        scores = self.matrix[cand] @ q
+        sel = top_k(scores, k)
+        return cand[sel], scores[sel]
+
+    def search_many(self, Q: np.ndarray, k: int, masks):
+        return [self.search(q, k, mask) for q, mask in zip(Q, masks)]
+
+
+BACKENDS = {"exact": ExactBackend, "ivf": IVFBackend}
+
+
+class SimilarityIndex:
+    """Cosine top-k search over a corpus normalized once at build time.
+
+    backend="auto" uses the exact scan, or the approximate IVF index above approx_threshold rows if a
+    threshold is given (opt-in: see IVFBackend for the recall trade-off); any name in BACKENDS (or a class with the same search signature) can be forced instead.
+    precision ("float32", "float16", "int8") and dims (keep the first dims components) shrink
+    the stored corpus; scoring runs on the compact matrix directly. shared_name puts that matrix in
+    a named shared-memory segment (see utils/shared_matrix.py).
+    """
+
+    def __init__(self, embeddings, backend="auto", approx_threshold=None, precision="float32", dims=None,
+                 shared_name=None, **backend_kwargs):
+        self.dims = dims
+        self.precision = precision
+        if dims is not None:
+            embeddings = np.asarray(embeddings)[:, :dims]
+        self.matrix = compact(normalize_rows(embeddings), precision)
+        if shared_name is not None and not file_backed(self.matrix):
+            # Multi-worker servers: the normalized/compact copy lives once in shared memory. A matrix
+            # still mapped from the embedding store is shared through the page cache already.
+            self.matrix = shared_index_matrix(shared_name, self.matrix)
+        if backend == "auto":
+            backend = "ivf" if approx_threshold is not None and len(self.matrix) > approx_threshold else "exact"
+        backend_cls = BACKENDS[backend] if isinstance(backend, str) else backend
+        self.backend = backend_cls(self.matrix, **backend_kwargs)
+
+    def __len__(self):
+        return len(self.matrix)
+
+    @property
+    def nbytes(self) -> int:
+        return self.matrix.nbytes
+
+    def _prepare(self, query) -> np.ndarray:
+        q = np.asarray(query, dtype=np.float32).reshape(-1)[:self.dims]
+        return q / max(float(np.linalg.norm(q)), 1e-12)
+
+    def scores(self, query) -> np.ndarray:
+        """Cosine score of every row, for callers that fuse it with other signals."""
+        return self.matrix @ self._prepare(query)
+
+    def search(self, query, k: int = 10, mask=None):
+        """Return (row indices, cosine scores) of the k best rows, optionally restricted to mask."""
+        if mask is not None:
+            mask = np.asarray(mask, dtype=bool)
+        return self.backend.search(self._prepare(query), k, mask)
+
+    def search_many(self, queries, k: int = 10, masks=None):
+        """Batched search: one (indices, scores) pair per query row."""
+        Q = np.asarray(queries, dtype=np.float32)
+        if self.dims is not None:
+            Q = Q[:, :self.dims]
+        Q = Q / np.maximum(np.linalg.norm(Q, axis=1, keepdims=True), 1e-12)
+        masks = [None] * len(Q) if masks is None else [None if m is None else np.asarray(m, dtype=bool) for m in masks]
+        return self.backend.search_many(Q, k, masks)
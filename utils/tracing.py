@@ -0,0 +1,158 @@
+"""Lightweight per-stage tracing and metrics.
+
+Disabled by default (set DSGP_TRACING=1 or call enable() for the whole process, or
+enable_in_context() for the current context only, e.g. one Streamlit session). When disabled,
+span() and trace() return one shared no-op context manager, so instrumented code pays a flag check.
+
+    with tracing.trace("recommend"):          # one request
+        with tracing.span("recommender.encode"):
+            ...
+
+Completed traces are logged as one JSON line on the "dsgp.trace" logger and kept as the
+latest trace of the thread that ran it. Stage timings aggregate into Prometheus-style
+histograms, see prometheus_text(); observe() feeds them directly for always-on timings
+such as encoder queue waits.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+logger = logging.getLogger("dsgp.trace")
+
+_enabled = os.environ.get("DSGP_TRACING") == "1"
+_NOOP = nullcontext()
+_current = ContextVar("dsgp_trace", default=None)
+_in_context = ContextVar("dsgp_tracing", default=False)
+# Nesting depth travels with the trace, so spans run on pool threads (copy_context) nest correctly
+_depth = ContextVar("dsgp_span_depth", default=0)
+_local = threading.local()
+_lock = threading.Lock()
+
+BUCKETS_MS = (0.1, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 10000)
+
+_stages = {}        # name -> [count, sum_ms, bucket counts...]
+_gauges = {}
+_collectors = []
+
+
+def enable(value: bool = True):
+    """Process-wide switch: every thread and session is traced."""
+    global _enabled
+    _enabled = value
+
+
+def enable_in_context(value: bool = True):
+    """Trace only requests made from the current context (and encoder jobs it submits)."""
+    _in_context.set(value)
+
+
+def enabled() -> bool:
+    return _enabled or _in_context.get()
+
+
+def _observe(name: str, ms: float):
+    with _lock:
+        stats = _stages.get(name)
+        if stats is None:
+            stats = _stages[name] = [0, 0.0] + [0] * len(BUCKETS_MS)
+        stats[0] += 1
+        stats[1] += ms
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                stats[2 + i] += 1
+
+
+@contextmanager
+def _span(name: str):
+    spans = _current.get()
+    depth = _depth.get()
+    token = _depth.set(depth + 1)
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - t0) * 1000
+        _depth.reset(token)
+        _observe(name, ms)
+        if spans is not None:
+            spans.append({"name": name, "ms": ms, "depth": depth, "start": t0})
+
+
+def span(name: str):
+    """Time one stage; nests under the active trace if there is one."""
+    if not (_enabled or _in_context.get()):
+        return _NOOP
+    return _span(name)
+
+
+@contextmanager
+def _trace(name: str):
+    spans = []
+    token = _current.set(spans)
+    t0 = time.perf_counter()
+    try:
+        with _span(name):
+            yield spans
+    finally:
+        _current.reset(token)
+        # Spans close innermost-first; list them in start order, offsets relative to the trace start
+        spans.sort(key=lambda s: s["start"])
+        for s in spans:
+            s["offset_ms"] = (s.pop("start") - t0) * 1000
+        record = {"trace": name, "total_ms": (time.perf_counter() - t0) * 1000, "spans": spans}
+        _local.last = record
+        logger.info(json.dumps(record))
+
+
+def trace(name: str):
+    """One request: collects the spans opened inside it into a single record."""
+    if not (_enabled or _in_context.get()) or _current.get() is not None:
+        # Disabled, or already inside a trace: behave like a plain span
+        return span(name)
+    return _trace(name)
+
+
+def last_trace():
+    """Latest completed trace of this thread (e.g. this Streamlit script run); never another thread's."""
+    return getattr(_local, "last", None)
+
+
+def observe(name: str, ms: float):
+    """Record one timing into the stage histograms, whether or not tracing is enabled."""
+    _observe(name, ms)
+
+
+def set_gauge(name: str, value: float):
+    with _lock:
+        _gauges[name] = float(value)
+
+
+def register_collector(fn):
+    """fn() -> {metric_name: value}, evaluated at export time (cache hit rates and the like)."""
+    _collectors.append(fn)
+
+
+def prometheus_text() -> str:
+    lines = ["# TYPE dsgp_stage_ms histogram"]
+    with _lock:
+        stages = {k: list(v) for k, v in _stages.items()}
+        gauges = dict(_gauges)
+    for fn in _collectors:
+        try:
+            gauges.update(fn())
+        except Exception:
+            logger.exception("Metrics collector failed")
+    for name, stats in sorted(stages.items()):
+        for bound, count in zip(BUCKETS_MS, stats[2:]):
+            lines.append(f'dsgp_stage_ms_bucket{{stage="{name}",le="{bound}"}} {count}')
+        lines.append(f'dsgp_stage_ms_bucket{{stage="{name}",le="+Inf"}} {stats[0]}')
+        lines.append(f'dsgp_stage_ms_sum{{stage="{name}"}} {stats[1]}')
+        lines.append(f'dsgp_stage_ms_count{{stage="{name}"}} {stats[0]}')
+    for name, value in sorted(gauges.items()):
+        lines.append(f"# TYPE dsgp_{name} gauge")
+        lines.append(f"dsgp_{name} {value}")
+    return "\n".join(lines) + "\n"